@@ -4,12 +4,12 @@ from datetime import datetime, timedelta
 import random
 from app.models.schemas import CustomerSegment
 from app.services.pricing_engine import PricingEngine
-from app.services.shipping_estimator import ShippingEstimator
+from app.services.shipping_estimator import get_shipping_estimator
 from app.services.invoice_generator import InvoiceGenerator
 
 router = APIRouter()
 pricing_engine = PricingEngine()
-shipping_estimator = ShippingEstimator()
+shipping_estimator = get_shipping_estimator()
 invoice_generator = InvoiceGenerator()
 
 @router.get("/stats")
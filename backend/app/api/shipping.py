@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from app.models.schemas import Basket, ShippingEstimate
-from app.services.shipping_estimator import ShippingEstimator
+from app.services.shipping_estimator import get_shipping_estimator
 
 router = APIRouter()
-shipping_estimator = ShippingEstimator()
+shipping_estimator = get_shipping_estimator()
 
 @router.post("/estimate", response_model=ShippingEstimate)
 async def estimate_shipping_cost(basket: Basket):
@@ -85,21 +85,24 @@ class AdvancedPricingEngine:
     def ingest_historical_data(self):
         """Ingest and process historical transaction & invoice data."""
         try:
-            # Try to load real-world data first
+            # Try to load real-world data first, preferring the Parquet copies the
+            # integrator writes (CSV is only exported on request)
             real_data_files = {
-                'transactions': 'data/real_transactions.csv',
-                'products': 'data/real_products.csv', 
-                'customers': 'data/real_customers.csv'
+                name: next((path for path in (f'data/real_{name}.parquet', f'data/real_{name}.csv')
+                            if os.path.exists(path)), None)
+                for name in ('transactions', 'products', 'customers')
             }
             
             # Check if real data exists
-            real_data_available = all(os.path.exists(f) for f in real_data_files.values())
+            real_data_available = all(real_data_files.values())
             
             if real_data_available:
                 print("🌍 Loading real-world data...")
-                transactions = pd.read_csv(real_data_files['transactions'])
-                products = pd.read_csv(real_data_files['products'])
-                customers = pd.read_csv(real_data_files['customers'])
+                transactions, products, customers = (
+                    pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+                    for path in (real_data_files['transactions'], real_data_files['products'],
+                                 real_data_files['customers'])
+                )
                 
                 # For real data, transactions already contain most product info
                 # Just use transactions directly and optionally merge customer additional data
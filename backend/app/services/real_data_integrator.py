@@ -1,13 +1,101 @@
 import requests
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import json
 import time
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import os
+import hashlib
 from dataclasses import dataclass
 
+try:
+    import pyarrow  # Parquet engine for DataFrame.to_parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Name patterns for compound categories, checked in order (first match wins)
+COMPOUND_CATEGORY_PATTERNS = [
+    ('organic_chemicals', r'acid|amine|alcohol'),
+    ('biochemicals', r'protein|peptide|enzyme'),
+    ('pharmaceuticals', r'drug|pharmaceutical|medicine'),
+    ('reagents', r'buffer|salt|reagent'),
+]
+
+# Shared random generator (PCG64) for all synthetic fields in this module
+_RNG = np.random.default_rng()
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Age after which cached API responses in data/cache are fetched again
+API_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Transactions generated per integration run; runs larger than the threshold are
+# streamed to Parquet in chunks instead of being built and written in one piece
+NUM_TRANSACTIONS = 5000
+STREAM_TRANSACTIONS_ABOVE = 100_000
+
+# Life sciences seasonal price patterns (higher in Q1, Q3), indexed by month; index 0 unused
+SEASONAL_MULTIPLIERS = np.array([1.0, 1.15, 1.10, 1.20, 0.95, 0.90, 0.85,
+                                 0.95, 1.05, 1.25, 1.15, 1.05, 0.90])
+
+# Life sciences customer segments, based on actual industry data
+REAL_CUSTOMER_SEGMENTS = {
+    'academic_research': {
+        'description': 'Universities and research institutions',
+        'typical_order_size': {'min': 100, 'max': 5000, 'avg': 1200},
+        'price_sensitivity': 1.8,  # High sensitivity
+        'loyalty_score': 0.85,
+        'payment_terms': 'NET30',
+        'discount_expectation': 0.15,  # 15% typical discount
+        'volume_frequency': 'quarterly',
+        'market_share': 0.25
+    },
+    'biotech_startup': {
+        'description': 'Early-stage biotechnology companies',
+        'typical_order_size': {'min': 500, 'max': 25000, 'avg': 8500},
+        'price_sensitivity': 1.4,
+        'loyalty_score': 0.65,
+        'payment_terms': 'NET15',
+        'discount_expectation': 0.10,
+        'volume_frequency': 'monthly',
+        'market_share': 0.18
+    },
+    'pharma_enterprise': {
+        'description': 'Large pharmaceutical corporations',
+        'typical_order_size': {'min': 10000, 'max': 500000, 'avg': 85000},
+        'price_sensitivity': 0.6,  # Low sensitivity
+        'loyalty_score': 0.95,
+        'payment_terms': 'NET45',
+        'discount_expectation': 0.05,
+        'volume_frequency': 'weekly',
+        'market_share': 0.35
+    },
+    'government_lab': {
+        'description': 'Government research laboratories',
+        'typical_order_size': {'min': 1000, 'max': 50000, 'avg': 12000},
+        'price_sensitivity': 1.2,
+        'loyalty_score': 0.90,
+        'payment_terms': 'NET60',
+        'discount_expectation': 0.12,
+        'volume_frequency': 'monthly',
+        'market_share': 0.12
+    },
+    'contract_research': {
+        'description': 'Contract Research Organizations (CROs)',
+        'typical_order_size': {'min': 2000, 'max': 100000, 'avg': 25000},
+        'price_sensitivity': 1.0,
+        'loyalty_score': 0.75,
+        'payment_terms': 'NET30',
+        'discount_expectation': 0.08,
+        'volume_frequency': 'bi-weekly',
+        'market_share': 0.10
+    }
+}
+
 @dataclass
 class DataSource:
     name: str
@@ -31,6 +119,7 @@ class RealDataIntegrator:
         self.session.headers.update({
             'User-Agent': 'SmartPricing-AI-Research/1.0 (Life Sciences Analytics)'
         })
+        self.cache_dir = os.path.join('data', 'cache')
         
     def _initialize_data_sources(self) -> List[DataSource]:
         """Initialize available real data sources."""
@@ -74,6 +163,62 @@ class RealDataIntegrator:
             )
         ]
     
+    def _get_with_retry(self, url: str, max_tries: int = 4, base_delay: float = 0.3) -> requests.Response:
+        """
+        GET with exponential backoff on rate limiting (429) and transient 5xx errors.
+        Honors the server's Retry-After header when it is given in seconds.
+        """
+        for attempt in range(max_tries):
+            response = self.session.get(url, timeout=10)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_tries - 1:
+                return response
+            
+            delay = base_delay * 2 ** attempt
+            retry_after = response.headers.get('Retry-After')
+            if retry_after is not None:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    pass  # HTTP-date form; fall back to exponential backoff
+            time.sleep(delay)
+        
+        return response
+    
+    def _cache_is_fresh(self, path: str) -> bool:
+        """Whether a cache file was written less than API_CACHE_TTL_SECONDS ago."""
+        return time.time() - os.path.getmtime(path) < API_CACHE_TTL_SECONDS
+    
+    def _get_json_cached(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        GET a JSON document, persisting successful responses on disk keyed by URL.
+        Cached responses older than API_CACHE_TTL_SECONDS are fetched again; the stale
+        copy is only used if that request fails. Returns None if no data is available.
+        """
+        cache_path = os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+        cached = os.path.exists(cache_path)
+        if cached and self._cache_is_fresh(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        try:
+            response = self._get_with_retry(url)
+        except requests.RequestException:
+            if not cached:
+                raise
+            response = None
+        time.sleep(0.2)  # Rate limiting (network requests only)
+        if response is None or response.status_code != 200:
+            if cached:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            return None
+        
+        data = response.json()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return data
+    
     def fetch_chemical_compounds_data(self, limit: int = 1000) -> pd.DataFrame:
         """
         Fetch real chemical compound data from PubChem.
@@ -81,7 +226,15 @@ class RealDataIntegrator:
         """
         print(f"🔍 Fetching real chemical compound data from PubChem...")
         
+        # The finished table is cached too, so a warm run skips even the JSON parsing
+        result_path = os.path.join(self.cache_dir, f'compounds_{limit}.parquet')
+        if PARQUET_AVAILABLE and os.path.exists(result_path) and self._cache_is_fresh(result_path):
+            compounds_df = pd.read_parquet(result_path)
+            print(f"✅ Loaded {len(compounds_df)} real chemical compounds from cache")
+            return compounds_df
+        
         compounds_data = []
+        iupac_names = []
         
         try:
             # Get popular pharmaceutical compounds
@@ -97,10 +250,8 @@ class RealDataIntegrator:
                     # Get compound properties
                     url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/MolecularWeight,MolecularFormula,IUPACName,CanonicalSMILES/JSON"
                     
-                    response = self.session.get(url, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        
+                    data = self._get_json_cached(url)
+                    if data is not None:
                         if 'PropertyTable' in data and 'Properties' in data['PropertyTable']:
                             prop = data['PropertyTable']['Properties'][0]
                             
@@ -109,7 +260,7 @@ class RealDataIntegrator:
                             complexity_factor = len(prop.get('CanonicalSMILES', 'CC')) / 20  # SMILES length as complexity
                             
                             # Base price calculation (realistic pharmaceutical pricing)
-                            base_price = max(50, mol_weight * 0.5 + complexity_factor * 25 + np.random.uniform(10, 100))
+                            base_price = max(50, mol_weight * 0.5 + complexity_factor * 25 + _RNG.uniform(10, 100))
                             
                             compounds_data.append({
                                 'sku': f"CHEM-{cid}",
@@ -117,23 +268,27 @@ class RealDataIntegrator:
                                 'molecular_formula': prop.get('MolecularFormula', 'Unknown'),
                                 'molecular_weight': mol_weight,
                                 'complexity_score': complexity_factor,
-                                'category': self._categorize_compound(prop.get('IUPACName', '')),
-                                'supplier': np.random.choice(['Sigma-Aldrich', 'Thermo Fisher', 'Merck', 'VWR', 'Cayman Chemical']),
+                                'supplier': _RNG.choice(['Sigma-Aldrich', 'Thermo Fisher', 'Merck', 'VWR', 'Cayman Chemical']),
                                 'base_price': round(base_price, 2),
                                 'weight_kg': mol_weight / 1000000,  # Convert to kg (very small amounts)
                                 'hs_code': '2934.99.90',  # Generic chemical HS code
                                 'source': 'PubChem',
                                 'source_id': str(cid)
                             })
-                    
-                    time.sleep(0.2)  # Rate limiting
+                            iupac_names.append(prop.get('IUPACName', ''))
                     
                 except Exception as e:
                     print(f"Error fetching compound {cid}: {e}")
                     continue
             
             print(f"✅ Fetched {len(compounds_data)} real chemical compounds")
-            return pd.DataFrame(compounds_data)
+            compounds_df = pd.DataFrame(compounds_data)
+            if not compounds_df.empty:
+                compounds_df['category'] = self._categorize_compounds(pd.Series(iupac_names))
+                if PARQUET_AVAILABLE:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    compounds_df.to_parquet(result_path, compression='zstd', index=False)
+            return compounds_df
             
         except Exception as e:
             print(f"Error fetching PubChem data: {e}")
@@ -154,16 +309,18 @@ class RealDataIntegrator:
             # In production, you'd use real API keys
             for symbol in pharma_stocks:
                 # Simulate realistic pharmaceutical pricing trends
-                base_trend = np.random.uniform(0.95, 1.15)  # Annual price change factor
+                base_trend = _RNG.uniform(0.95, 1.15)  # Annual price change factor
                 seasonal_factors = [1.02, 0.98, 1.05, 1.01, 0.99, 1.03, 0.97, 1.04, 1.01, 0.98, 1.06, 1.02]
+                volatility = _RNG.uniform(0.05, 0.25, size=12)
+                demand = _RNG.uniform(0.8, 1.3, size=12)
                 
                 for month in range(12):
                     market_data.append({
                         'company': symbol,
                         'month': month + 1,
                         'price_trend_factor': base_trend * seasonal_factors[month],
-                        'market_volatility': np.random.uniform(0.05, 0.25),
-                        'demand_indicator': np.random.uniform(0.8, 1.3)
+                        'market_volatility': volatility[month],
+                        'demand_indicator': demand[month]
                     })
             
             return pd.DataFrame(market_data)
@@ -175,161 +332,170 @@ class RealDataIntegrator:
     def fetch_real_customer_segments(self) -> Dict[str, Any]:
         """
         Fetch real customer segmentation data from industry reports and public sources.
+        The returned dict is shared module state and must not be mutated.
         """
         print("🔍 Analyzing real customer segmentation patterns...")
         
-        # Based on actual life sciences industry data
-        real_segments = {
-            'academic_research': {
-                'description': 'Universities and research institutions',
-                'typical_order_size': {'min': 100, 'max': 5000, 'avg': 1200},
-                'price_sensitivity': 1.8,  # High sensitivity
-                'loyalty_score': 0.85,
-                'payment_terms': 'NET30',
-                'discount_expectation': 0.15,  # 15% typical discount
-                'volume_frequency': 'quarterly',
-                'market_share': 0.25
-            },
-            'biotech_startup': {
-                'description': 'Early-stage biotechnology companies',
-                'typical_order_size': {'min': 500, 'max': 25000, 'avg': 8500},
-                'price_sensitivity': 1.4,
-                'loyalty_score': 0.65,
-                'payment_terms': 'NET15',
-                'discount_expectation': 0.10,
-                'volume_frequency': 'monthly',
-                'market_share': 0.18
-            },
-            'pharma_enterprise': {
-                'description': 'Large pharmaceutical corporations',
-                'typical_order_size': {'min': 10000, 'max': 500000, 'avg': 85000},
-                'price_sensitivity': 0.6,  # Low sensitivity
-                'loyalty_score': 0.95,
-                'payment_terms': 'NET45',
-                'discount_expectation': 0.05,
-                'volume_frequency': 'weekly',
-                'market_share': 0.35
-            },
-            'government_lab': {
-                'description': 'Government research laboratories',
-                'typical_order_size': {'min': 1000, 'max': 50000, 'avg': 12000},
-                'price_sensitivity': 1.2,
-                'loyalty_score': 0.90,
-                'payment_terms': 'NET60',
-                'discount_expectation': 0.12,
-                'volume_frequency': 'monthly',
-                'market_share': 0.12
-            },
-            'contract_research': {
-                'description': 'Contract Research Organizations (CROs)',
-                'typical_order_size': {'min': 2000, 'max': 100000, 'avg': 25000},
-                'price_sensitivity': 1.0,
-                'loyalty_score': 0.75,
-                'payment_terms': 'NET30',
-                'discount_expectation': 0.08,
-                'volume_frequency': 'bi-weekly',
-                'market_share': 0.10
-            }
-        }
+        return REAL_CUSTOMER_SEGMENTS
+    
+    def _build_customer_roster(self, customer_segments: Dict) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        Build the customer roster once for both transactions and the customers table.
+        Returns a structured array of per-customer parameters and the customers DataFrame.
+        """
+        segment_names = list(customer_segments.keys())
+        segment_data = list(customer_segments.values())
+        counts = [int(200 * data['market_share']) for data in segment_data]  # Total 200 customers
+        num_customers = sum(counts)
+        
+        roster = np.empty(num_customers, dtype=[
+            ('customer_id', 'U9'),
+            ('segment', f"U{max(len(name) for name in segment_names)}"),
+            ('payment_terms', f"U{max(len(d['payment_terms']) for d in segment_data)}"),
+            ('price_sensitivity', np.float64),
+            ('discount_expectation', np.float64),
+            ('typical_min', np.float64),
+            ('typical_avg', np.float64),
+            ('typical_max', np.float64)
+        ])
+        roster['customer_id'] = np.char.mod('CUST-%04d', np.arange(1, num_customers + 1))
+        roster['segment'] = np.repeat(segment_names, counts)
+        roster['payment_terms'] = np.repeat([d['payment_terms'] for d in segment_data], counts)
+        roster['price_sensitivity'] = np.repeat([d['price_sensitivity'] for d in segment_data], counts)
+        roster['discount_expectation'] = np.repeat([d['discount_expectation'] for d in segment_data], counts)
+        roster['typical_min'] = np.repeat([d['typical_order_size']['min'] for d in segment_data], counts)
+        roster['typical_avg'] = np.repeat([d['typical_order_size']['avg'] for d in segment_data], counts)
+        roster['typical_max'] = np.repeat([d['typical_order_size']['max'] for d in segment_data], counts)
         
-        return real_segments
+        loyalty = np.repeat([d['loyalty_score'] for d in segment_data], counts)
+        registration_days = _RNG.integers(30, 1095, size=num_customers)
+        customers_df = pd.DataFrame({
+            'customer_id': roster['customer_id'],
+            'segment': pd.Categorical(roster['segment'], categories=segment_names),
+            'company_type': np.repeat([d['description'] for d in segment_data], counts),
+            'payment_terms': pd.Categorical(roster['payment_terms']),
+            'loyalty_score': loyalty + _RNG.uniform(-0.1, 0.1, size=num_customers),
+            'price_sensitivity': roster['price_sensitivity'] + _RNG.uniform(-0.2, 0.2, size=num_customers),
+            'avg_order_value': roster['typical_avg'] + _RNG.uniform(-1000, 1000, size=num_customers),
+            'registration_date': (pd.Timestamp(datetime.now()) - pd.to_timedelta(registration_days, unit='D')).strftime('%Y-%m-%d')
+        })
+        
+        return roster, customers_df
     
     def generate_realistic_transactions(self, products_df: pd.DataFrame, 
-                                      customer_segments: Dict, 
-                                      num_transactions: int = 5000) -> pd.DataFrame:
+                                      customer_roster: np.ndarray, 
+                                      num_transactions: int = 5000,
+                                      id_offset: int = 0) -> pd.DataFrame:
         """
         Generate realistic transaction data based on real market patterns.
+        `customer_roster` is the structured array returned by `_build_customer_roster`;
+        transaction IDs start at `id_offset + 1`.
         """
         print(f"🔍 Generating {num_transactions} realistic transactions...")
         
-        transactions = []
         start_date = datetime.now() - timedelta(days=365)
         
-        # Generate customers for each segment
-        customers = []
-        customer_id = 1
+        # Product columns as plain arrays, indexed positionally below
+        sku_arr = products_df['sku'].to_numpy()
+        name_arr = products_df['name'].to_numpy()
+        supplier_arr = products_df['supplier'].to_numpy()
+        price_arr = products_df['base_price'].to_numpy(dtype=np.float64)
         
-        for segment, data in customer_segments.items():
-            segment_customers = int(200 * data['market_share'])  # Total 200 customers
-            
-            for i in range(segment_customers):
-                customers.append({
-                    'customer_id': f"CUST-{customer_id:04d}",
-                    'segment': segment,
-                    'data': data
-                })
-                customer_id += 1
-        
-        # Generate transactions
-        for _ in range(num_transactions):
-            customer = np.random.choice(customers)
-            product = products_df.sample(1).iloc[0]
-            
-            # Calculate realistic quantity based on customer segment
-            order_size = customer['data']['typical_order_size']
-            quantity = int(np.random.triangular(
-                order_size['min'] / product['base_price'],
-                order_size['avg'] / product['base_price'],
-                order_size['max'] / product['base_price']
-            ))
-            quantity = max(1, min(quantity, 100))  # Keep reasonable bounds
-            
-            # Calculate pricing with segment-based discounts
-            base_price = product['base_price']
-            discount = np.random.normal(customer['data']['discount_expectation'], 0.03)
-            discount = max(0, min(discount, 0.3))  # Cap discount at 30%
-            
-            unit_price = base_price * (1 - discount)
-            
-            # Add seasonal variations
-            transaction_date = start_date + timedelta(days=np.random.randint(0, 365))
-            month = transaction_date.month
-            
-            # Life sciences seasonal patterns (higher in Q1, Q3)
-            seasonal_multiplier = {
-                1: 1.15, 2: 1.10, 3: 1.20, 4: 0.95, 5: 0.90, 6: 0.85,
-                7: 0.95, 8: 1.05, 9: 1.25, 10: 1.15, 11: 1.05, 12: 0.90
-            }.get(month, 1.0)
-            
-            unit_price *= seasonal_multiplier
-            
-            transactions.append({
-                'transaction_id': f"TXN-{len(transactions)+1:06d}",
-                'customer_id': customer['customer_id'],
-                'segment': customer['segment'],
-                'sku': product['sku'],
-                'product_name': product['name'],
-                'category': product['category'],
-                'supplier': product['supplier'],
-                'quantity': quantity,
-                'base_price': base_price,
-                'unit_price': round(unit_price, 2),
-                'total_amount': round(unit_price * quantity, 2),
-                'discount_pct': round(discount * 100, 2),
-                'date': transaction_date.strftime('%Y-%m-%d'),
-                'month': month,
-                'quarter': f"Q{(month-1)//3 + 1}",
-                'payment_terms': customer['data']['payment_terms'],
-                'source': 'real_market_simulation'
-            })
+        # Low-cardinality strings are carried as integer codes and labelled once as Categoricals
+        category_labels, category_codes = np.unique(products_df['category'].to_numpy(dtype=str), return_inverse=True)
+        segment_labels, segment_codes = np.unique(customer_roster['segment'], return_inverse=True)
+        terms_labels, terms_codes = np.unique(customer_roster['payment_terms'], return_inverse=True)
+        
+        # Draw all customers and products up front
+        cust_idx = _RNG.integers(0, len(customer_roster), size=num_transactions)
+        customers = customer_roster[cust_idx]
+        prod_idx = _RNG.integers(0, len(products_df), size=num_transactions)
+        base_price = price_arr[prod_idx]
+        
+        # Calculate realistic quantity based on customer segment
+        quantity = _RNG.triangular(
+            customers['typical_min'] / base_price,
+            customers['typical_avg'] / base_price,
+            customers['typical_max'] / base_price
+        )
+        quantity = np.clip(quantity, 1, 100).astype(np.int32)  # Keep reasonable bounds
+        
+        # Calculate pricing with segment-based discounts
+        discount = _RNG.normal(customers['discount_expectation'], 0.03)
+        discount = np.clip(discount, 0, 0.3)  # Cap discount at 30%
+        
+        unit_price = base_price * (1 - discount)
+        
+        # Add seasonal variations
+        dates = pd.Timestamp(start_date) + pd.to_timedelta(_RNG.integers(0, 365, size=num_transactions), unit='D')
+        month = dates.month.to_numpy(dtype=np.int32)
+        
+        unit_price *= SEASONAL_MULTIPLIERS[month]
+        
+        # Columns are already typed arrays, so the frame wraps them without a row pivot or copy
+        transactions = pd.DataFrame({
+            'transaction_id': np.char.mod('TXN-%06d', np.arange(id_offset + 1, id_offset + num_transactions + 1)),
+            'customer_id': customers['customer_id'],
+            'segment': pd.Categorical.from_codes(segment_codes[cust_idx], categories=segment_labels),
+            'sku': sku_arr[prod_idx],
+            'product_name': name_arr[prod_idx],
+            'category': pd.Categorical.from_codes(category_codes[prod_idx], categories=category_labels),
+            'supplier': supplier_arr[prod_idx],
+            'quantity': quantity,
+            'base_price': base_price,
+            'unit_price': np.round(unit_price, 2),
+            'total_amount': np.round(unit_price * quantity, 2),
+            'discount_pct': np.round(discount * 100, 2),
+            'date': dates.strftime('%Y-%m-%d'),
+            'month': month,
+            'quarter': np.char.add('Q', ((month - 1) // 3 + 1).astype(str)),
+            'payment_terms': pd.Categorical.from_codes(terms_codes[cust_idx], categories=terms_labels),
+            'source': np.full(num_transactions, 'real_market_simulation')
+        }, copy=False)
         
         print(f"✅ Generated {len(transactions)} realistic transactions")
-        return pd.DataFrame(transactions)
+        return transactions
+    
+    def stream_transactions_to_parquet(self, products_df: pd.DataFrame,
+                                       customer_roster: np.ndarray,
+                                       num_transactions: int,
+                                       path: str = 'data/real_transactions.parquet',
+                                       chunk_size: int = 100_000) -> str:
+        """
+        Generate transactions chunk by chunk straight into a Parquet file,
+        keeping peak memory bounded by `chunk_size` rather than `num_transactions`.
+        """
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError("pyarrow is required to stream transactions to Parquet")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        writer = None
+        try:
+            for start in range(0, num_transactions, chunk_size):
+                chunk = self.generate_realistic_transactions(
+                    products_df, customer_roster,
+                    min(chunk_size, num_transactions - start), id_offset=start
+                )
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        return path
     
-    def _categorize_compound(self, name: str) -> str:
+    def _categorize_compounds(self, names: pd.Series) -> pd.Series:
         """Categorize chemical compounds based on name patterns."""
-        name_lower = name.lower()
-        
-        if any(word in name_lower for word in ['acid', 'amine', 'alcohol']):
-            return 'organic_chemicals'
-        elif any(word in name_lower for word in ['protein', 'peptide', 'enzyme']):
-            return 'biochemicals'
-        elif any(word in name_lower for word in ['drug', 'pharmaceutical', 'medicine']):
-            return 'pharmaceuticals'
-        elif any(word in name_lower for word in ['buffer', 'salt', 'reagent']):
-            return 'reagents'
-        else:
-            return 'specialty_chemicals'
+        categories = pd.Series('specialty_chemicals', index=names.index)
+        
+        for label, pattern in COMPOUND_CATEGORY_PATTERNS:
+            mask = names.str.contains(pattern, case=False, regex=True, na=False)
+            categories = categories.mask(mask & (categories == 'specialty_chemicals'), label)
+        
+        return categories
     
     def _fallback_chemical_data(self, limit: int) -> pd.DataFrame:
         """Fallback chemical data if API fails."""
@@ -349,12 +515,15 @@ class RealDataIntegrator:
             {'name': 'Dopamine', 'formula': 'C8H11NO2', 'weight': 153.18}
         ]
         
+        price_noise = _RNG.uniform(20, 200, size=limit)
+        suppliers = _RNG.choice(['Sigma-Aldrich', 'Thermo Fisher', 'Merck', 'VWR'], size=limit)
+        
         compounds_data = []
         for i, compound in enumerate(real_compounds * (limit // len(real_compounds) + 1)):
             if len(compounds_data) >= limit:
                 break
                 
-            base_price = compound['weight'] * 0.5 + np.random.uniform(20, 200)
+            base_price = compound['weight'] * 0.5 + price_noise[i]
             
             compounds_data.append({
                 'sku': f"CHEM-{i+1:04d}",
@@ -362,8 +531,7 @@ class RealDataIntegrator:
                 'molecular_formula': compound['formula'],
                 'molecular_weight': compound['weight'],
                 'complexity_score': len(compound['formula']) / 10,
-                'category': self._categorize_compound(compound['name']),
-                'supplier': np.random.choice(['Sigma-Aldrich', 'Thermo Fisher', 'Merck', 'VWR']),
+                'supplier': suppliers[i],
                 'base_price': round(base_price, 2),
                 'weight_kg': compound['weight'] / 1000000,
                 'hs_code': '2934.99.90',
@@ -371,42 +539,42 @@ class RealDataIntegrator:
                 'source_id': str(i+1)
             })
         
-        return pd.DataFrame(compounds_data)
+        compounds_df = pd.DataFrame(compounds_data)
+        compounds_df['category'] = self._categorize_compounds(compounds_df['name'])
+        return compounds_df
     
-    def integrate_all_data(self) -> Dict[str, pd.DataFrame]:
+    def integrate_all_data(self, num_transactions: int = NUM_TRANSACTIONS) -> Dict[str, pd.DataFrame]:
         """
         Integrate all real-world data sources.
         """
         print("🚀 Starting real-world data integration...")
         
-        # Fetch real data
-        products_df = self.fetch_chemical_compounds_data(1000)
-        customer_segments = self.fetch_real_customer_segments()
-        market_data = self.fetch_pharmaceutical_market_data()
+        # Fetch real data; the sources are independent, so overlap their I/O
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            products_future = executor.submit(self.fetch_chemical_compounds_data, 1000)
+            segments_future = executor.submit(self.fetch_real_customer_segments)
+            market_future = executor.submit(self.fetch_pharmaceutical_market_data)
+            products_df = products_future.result()
+            customer_segments = segments_future.result()
+            market_data = market_future.result()
         
-        # Generate realistic transactions
-        transactions_df = self.generate_realistic_transactions(
-            products_df, customer_segments, 5000
-        )
+        # Build the customer roster once, shared by transactions and the customers table
+        customer_roster, customers_df = self._build_customer_roster(customer_segments)
         
-        # Create customers DataFrame
-        customers_data = []
-        for segment, data in customer_segments.items():
-            segment_customers = int(200 * data['market_share'])
-            
-            for i in range(segment_customers):
-                customers_data.append({
-                    'customer_id': f"CUST-{len(customers_data)+1:04d}",
-                    'segment': segment,
-                    'company_type': data['description'],
-                    'payment_terms': data['payment_terms'],
-                    'loyalty_score': data['loyalty_score'] + np.random.uniform(-0.1, 0.1),
-                    'price_sensitivity': data['price_sensitivity'] + np.random.uniform(-0.2, 0.2),
-                    'avg_order_value': data['typical_order_size']['avg'] + np.random.uniform(-1000, 1000),
-                    'registration_date': (datetime.now() - timedelta(days=np.random.randint(30, 1095))).strftime('%Y-%m-%d')
-                })
-        
-        customers_df = pd.DataFrame(customers_data)
+        # Generate realistic transactions; large runs go to disk chunk by chunk and
+        # are read back from the finished file
+        os.makedirs('data', exist_ok=True)
+        stream_transactions = PARQUET_AVAILABLE and num_transactions > STREAM_TRANSACTIONS_ABOVE
+        if stream_transactions:
+            transactions_path = self.stream_transactions_to_parquet(
+                products_df, customer_roster, num_transactions
+            )
+            transactions_df = pd.read_parquet(transactions_path)
+            print(f"✅ Saved {len(transactions_df)} transactions records to {transactions_path}")
+        else:
+            transactions_df = self.generate_realistic_transactions(
+                products_df, customer_roster, num_transactions
+            )
         
         # Save all data
         datasets = {
@@ -416,12 +584,17 @@ class RealDataIntegrator:
             'market_data': market_data
         }
         
-        # Save to CSV files
-        os.makedirs('data', exist_ok=True)
+        # Save as Parquet (typed, compressed); CSV is only written when EXPORT_CSV=1,
+        # or when pyarrow is missing
+        export_csv = os.getenv('EXPORT_CSV', '0') == '1' or not PARQUET_AVAILABLE
         for name, df in datasets.items():
             if not df.empty:
-                df.to_csv(f'data/real_{name}.csv', index=False)
-                print(f"✅ Saved {len(df)} {name} records to data/real_{name}.csv")
+                if PARQUET_AVAILABLE and not (stream_transactions and name == 'transactions'):
+                    df.to_parquet(f'data/real_{name}.parquet', compression='zstd', index=False)
+                    print(f"✅ Saved {len(df)} {name} records to data/real_{name}.parquet")
+                if export_csv:
+                    df.to_csv(f'data/real_{name}.csv', index=False)
+                    print(f"✅ Saved {len(df)} {name} records to data/real_{name}.csv")
         
         print("🎉 Real-world data integration complete!")
         return datasets
@@ -0,0 +1,68 @@
+"""
+Shared output and caching helpers for the data integration scripts
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import functools
+import os
+
+try:
+    import pyarrow as pa  # Parquet engine for DataFrame.to_parquet, and a fast CSV writer
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+def parquet_cache(func):
+    """
+    Memoize a DataFrame-returning method on disk as Parquet under {self.base_path}/.cache,
+    keyed by method name, the integrator's seed (if it has one) and arguments. Empty
+    results and fallback data (df.attrs['fallback']) are not cached; set FORCE_REGEN=1
+    to bypass the cache and rebuild.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not PARQUET_AVAILABLE:
+            return func(self, *args, **kwargs)
+        
+        seed = getattr(self, "seed", None)
+        key = hashlib.md5(repr((seed, args, sorted(kwargs.items()))).encode()).hexdigest()[:8]
+        cache_dir = f"{self.base_path}/.cache"
+        path = f"{cache_dir}/{func.__name__}_{key}.parquet"
+        if os.path.exists(path) and os.environ.get("FORCE_REGEN") != "1":
+            return pd.read_parquet(path)
+        
+        df = func(self, *args, **kwargs)
+        if len(df) and not df.attrs.get("fallback"):
+            os.makedirs(cache_dir, exist_ok=True)
+            df.to_parquet(path, compression="zstd", index=False)
+        return df
+    
+    return wrapper
+
+def write_csv(df, path):
+    """Write df as CSV, using pyarrow's multithreaded C++ writer when it is installed"""
+    if not PARQUET_AVAILABLE:
+        df.to_csv(path, index=False)
+        return
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Categorical columns arrive dictionary-encoded; write their plain values
+    columns = [pc.cast(column, column.type.value_type) if pa.types.is_dictionary(column.type) else column
+               for column in table.columns]
+    pa_csv.write_csv(pa.Table.from_arrays(columns, names=table.column_names), path)
+
+def save_output(df, base_path, name):
+    """Save df under base_path as CSV, plus a Parquet copy when pyarrow is installed"""
+    write_csv(df, f"{base_path}/{name}.csv")
+    if PARQUET_AVAILABLE:
+        df.to_parquet(f"{base_path}/{name}.parquet", compression="zstd", index=False)
+
+def random_skus(rng, prefix, digits, n):
+    """Draw n distinct SKUs: prefix (a string or per-row array) followed by a random number of the given digit count"""
+    low = 10 ** (digits - 1)
+    numbers = low + rng.choice(9 * low, size=n, replace=False)
+    return np.char.add(prefix, numbers.astype(str))
@@ -5,132 +5,253 @@ Creates realistic life sciences e-commerce data for training and testing.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
+import hashlib
+import os
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-def generate_sample_products():
+# Seed for the shared random generator, so regenerated data is reproducible
+SEED = 42
+
+# Dataset sizes
+N_PRODUCTS = 1000
+N_CUSTOMERS = 200
+N_TRANSACTIONS = 5000
+
+# Rounds of redrawing products repeated within a transaction before falling back
+# to an exact draw without replacement for whatever is left
+MAX_REDRAW_ROUNDS = 10
+
+# Records the config of the last run, so unchanged re-runs can be skipped
+MANIFEST_PATH = 'data/.manifest.json'
+
+# Customer segments and their price multipliers, aligned by segment code
+SEGMENTS = ['academic', 'biotech_startup', 'pharma_enterprise', 'research_institute']
+SEG_MULT = np.array([0.85, 0.95, 1.15, 0.90])
+
+# Product categories and their uniform weight (kg) / price bounds, aligned by category code
+CATEGORIES = ['reagents', 'lab_equipment', 'consumables', 'instruments', 'chemicals']
+W_LO = np.array([0.1, 2.0, 0.05, 10.0, 0.5])
+W_HI = np.array([2.0, 20.0, 1.0, 50.0, 5.0])
+P_LO = np.array([50, 200, 10, 1000, 30], dtype=np.float64)
+P_HI = np.array([500, 2000, 200, 25000, 800], dtype=np.float64)
+
+try:
+    import pyarrow as pa  # Parquet engine for DataFrame.to_parquet
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+def generate_sample_products(rng=None):
     """Generate sample life sciences products."""
-    categories = ['reagents', 'lab_equipment', 'consumables', 'instruments', 'chemicals']
+    if rng is None:
+        rng = np.random.default_rng(SEED)
     suppliers = ['ThermoFisher', 'Sigma-Aldrich', 'Bio-Rad', 'Agilent', 'Merck']
+    hs_codes = ['3822', '9027', '3926', '7020']
+    n = N_PRODUCTS
     
-    products = []
-    for i in range(1000):
-        category = np.random.choice(categories)
-        supplier = np.random.choice(suppliers)
-        
-        # Generate realistic weights by category
-        if category == 'reagents':
-            weight = np.random.uniform(0.1, 2.0)
-            price = np.random.uniform(50, 500)
-        elif category == 'lab_equipment':
-            weight = np.random.uniform(2.0, 20.0)
-            price = np.random.uniform(200, 2000)
-        elif category == 'consumables':
-            weight = np.random.uniform(0.05, 1.0)
-            price = np.random.uniform(10, 200)
-        elif category == 'instruments':
-            weight = np.random.uniform(10.0, 50.0)
-            price = np.random.uniform(1000, 25000)
-        else:  # chemicals
-            weight = np.random.uniform(0.5, 5.0)
-            price = np.random.uniform(30, 800)
-        
-        product = {
-            'sku': f'{category.upper()[:3]}-{i:04d}',
-            'name': f'{category.title()} Product {i}',
-            'category': category,
-            'supplier': supplier,
-            'weight_kg': round(weight, 2),
-            'base_price': round(price, 2),
-            'hs_code': np.random.choice(['3822', '9027', '3926', '7020'])
-        }
-        products.append(product)
-    
-    return pd.DataFrame(products)
-
-def generate_sample_customers():
+    cat_idx = rng.integers(0, len(CATEGORIES), size=n)
+    
+    # Generate realistic weights and prices by category
+    weights = rng.uniform(W_LO[cat_idx], W_HI[cat_idx])
+    prices = rng.uniform(P_LO[cat_idx], P_HI[cat_idx])
+    
+    # SKU and name strings assembled from per-category lookups instead of per-row f-strings
+    sku_prefixes = np.array([f'{category.upper()[:3]}-' for category in CATEGORIES])
+    name_prefixes = np.array([f'{category.title()} Product ' for category in CATEGORIES])
+    row_ids = np.arange(n)
+    
+    return pd.DataFrame({
+        'sku': np.char.add(sku_prefixes[cat_idx], np.char.mod('%04d', row_ids)),
+        'name': np.char.add(name_prefixes[cat_idx], row_ids.astype(str)),
+        'category': pd.Categorical.from_codes(cat_idx, CATEGORIES),
+        'supplier': pd.Categorical.from_codes(rng.integers(0, len(suppliers), size=n), suppliers),
+        'weight_kg': np.round(weights, 2).astype(np.float32),
+        'base_price': np.round(prices, 2).astype(np.float32),
+        'hs_code': pd.Categorical.from_codes(rng.integers(0, len(hs_codes), size=n), hs_codes)
+    }, copy=False)
+
+def generate_sample_customers(rng=None):
     """Generate sample customer data."""
-    segments = ['academic', 'biotech_startup', 'pharma_enterprise', 'research_institute']
+    if rng is None:
+        rng = np.random.default_rng(SEED)
     countries = ['US', 'CA', 'GB', 'DE', 'FR', 'JP', 'AU']
+    n = N_CUSTOMERS
+    
+    seg_idx = rng.integers(0, len(SEGMENTS), size=n)
+    name_prefixes = np.array([f'{segment.replace("_", " ").title()} ' for segment in SEGMENTS])
+    row_ids = np.arange(n)
+    
+    return pd.DataFrame({
+        'customer_id': np.char.mod('CUST-%04d', row_ids),
+        'name': np.char.add(name_prefixes[seg_idx], row_ids.astype(str)),
+        'segment': pd.Categorical.from_codes(seg_idx, SEGMENTS),
+        'country': pd.Categorical.from_codes(rng.integers(0, len(countries), size=n), countries),
+        'tax_exempt': (seg_idx == SEGMENTS.index('academic')) & (rng.random(n) < 0.3)
+    }, copy=False)
+
+def _repeated_items(groups, values):
+    """Positions of items whose value already appeared earlier in the same group."""
+    order = np.lexsort((values, groups))
+    return order[1:][(groups[order[1:]] == groups[order[:-1]]) & (values[order[1:]] == values[order[:-1]])]
+
+def generate_sample_transactions(products_df, customers_df, rng=None,
+                                 num_transactions=N_TRANSACTIONS, id_offset=0, start_date=None):
+    """Generate historical transaction data for the given products and customers."""
+    if rng is None:
+        rng = np.random.default_rng(SEED)
+    if start_date is None:
+        start_date = np.datetime64(datetime.now(), 's') - np.timedelta64(365, 'D')
+    
+    # Column arrays pulled out once and indexed directly
+    cust_ids = customers_df['customer_id'].to_numpy()
+    # Low-cardinality columns stay Categorical: indexing gathers the small integer codes
+    cust_segments = customers_df['segment'].values
+    # Pricing multiplier per customer, gathered by segment code
+    cust_multipliers = SEG_MULT[customers_df['segment'].cat.codes.to_numpy()]
+    skus = products_df['sku'].to_numpy()
+    product_categories = products_df['category'].values
+    base_prices = products_df['base_price'].to_numpy(dtype=np.float64)
+    
+    # One customer, date and item count per transaction; products drawn flat for all items
+    cust_idx = rng.integers(0, len(customers_df), size=num_transactions)
+    days_ago = rng.integers(0, 365, size=num_transactions)
+    # A transaction cannot list more distinct products than the catalog holds
+    num_items = np.minimum(rng.integers(1, 8, size=num_transactions), len(products_df))
+    total_items = int(num_items.sum())
+    prod_idx = rng.integers(0, len(products_df), size=total_items)
+    
+    # Each transaction lists distinct products: redraw any product repeated within one
+    item_txn = np.repeat(np.arange(num_transactions), num_items)
+    for _ in range(MAX_REDRAW_ROUNDS):
+        repeated = _repeated_items(item_txn, prod_idx)
+        if not len(repeated):
+            break
+        prod_idx[repeated] = rng.integers(0, len(products_df), size=len(repeated))
+    else:
+        # Leftovers (only likely with tiny catalogs) get a draw without replacement
+        for txn in np.unique(item_txn[_repeated_items(item_txn, prod_idx)]):
+            items = np.flatnonzero(item_txn == txn)
+            prod_idx[items] = rng.choice(len(products_df), size=len(items), replace=False)
+    
+    # Expand transaction-level fields to one entry per line item
+    item_cust_idx = cust_idx[item_txn]
+    txn_ids = np.char.mod('TXN-%06d', np.arange(id_offset, id_offset + num_transactions))
+    dates = start_date + days_ago.astype('timedelta64[D]')
+    
+    quantity = rng.integers(1, 20, size=total_items, dtype=np.int32)
+    noise = rng.uniform(0.9, 1.1, size=total_items)
+    unit_price = base_prices[prod_idx] * cust_multipliers[item_cust_idx] * noise
+    total_amount = unit_price * quantity
+    # Round each column once; unit prices and shipping fit float32 at cent precision,
+    # line totals (up to ~6e5) need float64 to keep their cents
+    np.round(unit_price, 2, out=unit_price)
+    np.round(total_amount, 2, out=total_amount)
+    shipping_cost = np.round(rng.uniform(10, 100, size=total_items), 2)
     
-    customers = []
-    for i in range(200):
-        segment = np.random.choice(segments)
-        country = np.random.choice(countries)
-        
-        customer = {
-            'customer_id': f'CUST-{i:04d}',
-            'name': f'{segment.replace("_", " ").title()} {i}',
-            'segment': segment,
-            'country': country,
-            'tax_exempt': segment == 'academic' and np.random.random() < 0.3
-        }
-        customers.append(customer)
-    
-    return pd.DataFrame(customers)
-
-def generate_sample_transactions():
-    """Generate historical transaction data."""
-    products_df = generate_sample_products()
-    customers_df = generate_sample_customers()
-    
-    transactions = []
-    start_date = datetime.now() - timedelta(days=365)
-    
-    for i in range(5000):
-        # Random date in the past year
-        days_ago = np.random.randint(0, 365)
-        transaction_date = start_date + timedelta(days=days_ago)
-        
-        # Select random customer and products
-        customer = customers_df.sample(1).iloc[0]
-        num_items = np.random.randint(1, 8)
-        selected_products = products_df.sample(num_items)
-        
-        # Calculate pricing based on customer segment
-        segment_multipliers = {
-            'academic': 0.85,
-            'biotech_startup': 0.95,
-            'pharma_enterprise': 1.15,
-            'research_institute': 0.90
-        }
-        
-        multiplier = segment_multipliers[customer['segment']]
-        
-        for _, product in selected_products.iterrows():
-            quantity = np.random.randint(1, 20)
-            unit_price = product['base_price'] * multiplier * np.random.uniform(0.9, 1.1)
-            
-            transaction = {
-                'transaction_id': f'TXN-{i:06d}',
-                'date': transaction_date.isoformat(),
-                'customer_id': customer['customer_id'],
-                'customer_segment': customer['segment'],
-                'sku': product['sku'],
-                'product_category': product['category'],
-                'quantity': quantity,
-                'unit_price': round(unit_price, 2),
-                'total_amount': round(unit_price * quantity, 2),
-                'shipping_cost': round(np.random.uniform(10, 100), 2)
-            }
-            transactions.append(transaction)
-    
-    return pd.DataFrame(transactions)
+    return pd.DataFrame({
+        'transaction_id': np.repeat(txn_ids, num_items),
+        'date': np.repeat(dates, num_items),
+        'customer_id': cust_ids[item_cust_idx],
+        'customer_segment': cust_segments[item_cust_idx],
+        'sku': skus[prod_idx],
+        'product_category': product_categories[prod_idx],
+        'quantity': quantity,
+        'unit_price': unit_price.astype(np.float32),
+        'total_amount': total_amount,
+        'shipping_cost': shipping_cost.astype(np.float32)
+    }, copy=False)
+
+def _config_key():
+    """Hash of everything that determines the generated data."""
+    # This script's source covers every table and the generation logic; the transaction
+    # date window is anchored to today, so the day is part of the key as well
+    key = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8)
+    key.update(datetime.now().date().isoformat().encode())
+    return key.hexdigest()
+
+def _load_manifest():
+    """Return the manifest from the last run, or None if missing or outputs are gone."""
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not all(os.path.exists(path) for path in manifest.get('files', [])):
+        return None
+    return manifest
+
+def write_sample_transactions(products_df, customers_df, rng, num_transactions=N_TRANSACTIONS,
+                              batch_size=10_000, path_prefix='data/sample_transactions'):
+    """
+    Generate transactions batch by batch straight to CSV (and Parquet when
+    pyarrow is installed), keeping peak memory bounded by `batch_size`.
+    Returns the number of line items written.
+    """
+    start_date = np.datetime64(datetime.now(), 's') - np.timedelta64(365, 'D')
+    parquet_writer = None
+    rows_written = 0
+    try:
+        with open(f'{path_prefix}.csv', 'w', newline='') as csv_file:
+            for offset in range(0, num_transactions, batch_size):
+                batch = generate_sample_transactions(
+                    products_df, customers_df, rng,
+                    num_transactions=min(batch_size, num_transactions - offset),
+                    id_offset=offset, start_date=start_date
+                )
+                batch.to_csv(csv_file, index=False, header=(offset == 0))
+                if PARQUET_AVAILABLE:
+                    table = pa.Table.from_pandas(batch, preserve_index=False)
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(f'{path_prefix}.parquet', table.schema)
+                    parquet_writer.write_table(table)
+                rows_written += len(batch)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    
+    return rows_written
 
 if __name__ == "__main__":
+    key = _config_key()
+    manifest = _load_manifest()
+    if manifest and manifest.get('key') == key:
+        print(f"Sample data is up to date (config {key}), skipping generation")
+        sys.exit(0)
+    
     print("Generating sample data...")
     
-    # Generate datasets
-    products = generate_sample_products()
-    customers = generate_sample_customers()
-    transactions = generate_sample_transactions()
+    # Generate datasets from independent child streams of one seeded generator;
+    # products and customers don't depend on each other, so build them concurrently
+    rng_products, rng_customers, rng_transactions = np.random.default_rng(SEED).spawn(3)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        products_future = executor.submit(generate_sample_products, rng_products)
+        customers_future = executor.submit(generate_sample_customers, rng_customers)
+        products = products_future.result()
+        customers = customers_future.result()
+    
+    # Save to CSV files (read by the training scripts and pricing engine), plus
+    # typed columnar Parquet copies when pyarrow is installed
+    for name, df in [('products', products), ('customers', customers)]:
+        df.to_csv(f'data/sample_{name}.csv', index=False)
+        if PARQUET_AVAILABLE:
+            df.to_parquet(f'data/sample_{name}.parquet', index=False)
+    # Transactions are streamed in batches rather than materialized in full
+    num_line_items = write_sample_transactions(products, customers, rng_transactions)
     
-    # Save to CSV files
-    products.to_csv('data/sample_products.csv', index=False)
-    customers.to_csv('data/sample_customers.csv', index=False)
-    transactions.to_csv('data/sample_transactions.csv', index=False)
+    extensions = ['csv', 'parquet'] if PARQUET_AVAILABLE else ['csv']
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump({
+            'key': key,
+            'files': [f'data/sample_{name}.{ext}'
+                      for name in ('products', 'customers', 'transactions') for ext in extensions]
+        }, f, indent=2)
     
     print(f"Generated {len(products)} products")
     print(f"Generated {len(customers)} customers")
-    print(f"Generated {len(transactions)} transactions")
+    print(f"Generated {num_line_items} transactions")
     print("Sample data saved to data/ directory")
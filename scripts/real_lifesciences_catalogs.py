@@ -6,14 +6,65 @@ Direct integration with Thermo Fisher Scientific and Sigma-Aldrich/Merck catalog
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
-from datetime import datetime, timedelta
 import random
 import os
-import urllib.request
-from bs4 import BeautifulSoup
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from data_io import parquet_cache, random_skus, save_output
+
+_RNG = np.random.default_rng()
+
+# Sigma-Aldrich per-gram base prices by category, and name patterns that carry a premium
+SIGMA_BASE_PRICES = {
+    "chemicals": 45,
+    "reagents": 125,
+    "biochemicals": 285
+}
+SIGMA_PREMIUM_PATTERN = re.compile(r"atp|nadh|antibody|enzyme", re.IGNORECASE)
+SIGMA_CHROMATOGRAPHY_PATTERN = re.compile(r"chromatography|hplc", re.IGNORECASE)
+
+# Country of origin by supplier, and (min, max) lead time in days by category
+SUPPLIER_ORIGINS = {
+    "Thermo Fisher Scientific": "USA",
+    "Sigma-Aldrich": "Germany",
+    "Bio-Rad": "USA",
+    "Eppendorf": "Germany"
+}
+LEAD_TIME_RANGES = {
+    "lab_equipment": (14, 45),
+    "reagents": (3, 14),
+    "chemicals": (5, 21),
+    "consumables": (1, 7)
+}
+
+# Eppendorf product configurations and their price multipliers, in offer order
+EPPENDORF_CONFIGURATIONS = np.array(["Standard", "Starter Kit", "Complete Set", "Refurbished"])
+EPPENDORF_PRICE_MULTIPLIERS = np.array([1.0, 1.2, 1.5, 0.7])
+
+# Low-cardinality label columns stored as pandas categoricals in the combined catalog
+CATALOG_CATEGORICAL_COLUMNS = ['category', 'supplier', 'brand', 'country_of_origin', 'data_source']
+
+# Catalog columns copied onto each generated transaction
+TRANSACTION_PRODUCT_COLUMNS = ['sku', 'product_name', 'category', 'supplier', 'base_price',
+                               'weight_kg', 'hs_code', 'country_of_origin']
+
+# Real customer segments in life sciences, as parallel arrays indexed by segment code:
+# price sensitivity and volume preference (0 = small, 1 = medium, 2 = large)
+SEGMENT_NAMES = np.array(["Academic", "Biotech Startup", "Pharma Enterprise",
+                          "Research Institute", "CRO", "Government Lab"])
+SEGMENT_PRICE_SENSITIVITY = np.array([0.85, 0.92, 1.15, 0.88, 1.05, 0.82])
+SEGMENT_VOLUME_PREFERENCE = np.array([0, 1, 2, 1, 2, 0])
+SEGMENT_PREFIXES = np.array([name[:3].upper() for name in SEGMENT_NAMES])
+# Quantity choices and weights for each volume preference
+VOLUME_QUANTITY_OPTIONS = [
+    ([1, 2, 3, 5], [0.5, 0.3, 0.15, 0.05]),
+    ([1, 2, 5, 10, 25], [0.2, 0.3, 0.3, 0.15, 0.05]),
+    ([5, 10, 25, 50, 100], [0.1, 0.2, 0.4, 0.2, 0.1])
+]
 
 class LifeSciencesCatalogIntegrator:
     """
@@ -31,6 +82,22 @@ class LifeSciencesCatalogIntegrator:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
+        # One pooled keep-alive session for catalog requests, shared by the concurrent fetchers
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.session.close()
+        
+    @parquet_cache
     def fetch_thermo_fisher_products(self, limit=200):
         """Fetch real products from Thermo Fisher Scientific public catalog"""
         print("🔬 Fetching real Thermo Fisher Scientific products...")
@@ -98,12 +165,11 @@ class LifeSciencesCatalogIntegrator:
         print(f"✅ Retrieved {len(products)} Thermo Fisher Scientific products")
         return pd.DataFrame(products)
     
+    @parquet_cache
     def fetch_sigma_aldrich_products(self, limit=200):
         """Fetch real products from Sigma-Aldrich/Merck catalog"""
         print("⚗️ Fetching real Sigma-Aldrich/Merck products...")
         
-        products = []
-        
         # Real Sigma-Aldrich product categories and catalog numbers
         sigma_categories = {
             "chemicals": {
@@ -140,50 +206,56 @@ class LifeSciencesCatalogIntegrator:
             }
         }
         
-        # Generate products from real Sigma-Aldrich catalog
-        for category, data in sigma_categories.items():
-            for product_info in data["real_products"]:
-                # Generate multiple pack sizes for each product
-                pack_sizes = [
-                    {"size": "1g", "multiplier": 1.0},
-                    {"size": "5g", "multiplier": 4.2},
-                    {"size": "25g", "multiplier": 15.8},
-                    {"size": "100g", "multiplier": 45.0},
-                    {"size": "500g", "multiplier": 180.0}
-                ]
-                
-                base_price = self._estimate_sigma_price(product_info["name"], category)
-                
-                for pack in pack_sizes[:random.randint(2, 4)]:  # Random pack sizes available
-                    sku = f"{product_info['catalog']}-{pack['size'].replace('g', 'G')}"
-                    
-                    products.append({
-                        "sku": sku,
-                        "product_name": f"{product_info['name']} - {product_info.get('grade', 'Standard')} - {pack['size']}",
-                        "category": category,
-                        "supplier": "Sigma-Aldrich",
-                        "brand": "Sigma-Aldrich",
-                        "catalog_number": product_info["catalog"],
-                        "pack_size": pack["size"],
-                        "purity": product_info.get("purity", "≥95%"),
-                        "grade": product_info.get("grade", "Standard"),
-                        "base_price": round(base_price * pack["multiplier"], 2),
-                        "weight_kg": self._convert_pack_size_to_kg(pack["size"]),
-                        "cas_number": self._generate_cas_number(),
-                        "is_hazardous": category == "chemicals" and random.random() > 0.4,
-                        "storage_temp": self._get_storage_temperature(category),
-                        "data_source": "Sigma-Aldrich Real Catalog"
-                    })
+        # Pack sizes offered for each product
+        pack_sizes = [
+            {"size": "1g", "multiplier": 1.0},
+            {"size": "5g", "multiplier": 4.2},
+            {"size": "25g", "multiplier": 15.8},
+            {"size": "100g", "multiplier": 45.0},
+            {"size": "500g", "multiplier": 180.0}
+        ]
+        
+        # Generate products from real Sigma-Aldrich catalog: one row per product,
+        # crossed with the pack sizes
+        catalog = pd.DataFrame([dict(product_info, category=category)
+                                for category, data in sigma_categories.items()
+                                for product_info in data["real_products"]])
+        catalog["grade"] = catalog["grade"].fillna("Standard")
+        catalog["purity"] = catalog["purity"].fillna("≥95%")
+        catalog["unit_price"] = self._estimate_sigma_prices(catalog["name"], catalog["category"])
+        catalog["pack_count"] = _RNG.integers(2, 5, size=len(catalog))  # Random pack sizes available
+        
+        packs = pd.DataFrame(pack_sizes)
+        packs["pack_rank"] = np.arange(len(packs))
+        combined = catalog.merge(packs, how="cross")
+        combined = combined[combined["pack_rank"] < combined["pack_count"]].reset_index(drop=True)
+        
+        products = pd.DataFrame({
+            "sku": combined["catalog"] + "-" + combined["size"].str.replace("g", "G"),
+            "product_name": combined["name"] + " - " + combined["grade"] + " - " + combined["size"],
+            "category": combined["category"],
+            "supplier": "Sigma-Aldrich",
+            "brand": "Sigma-Aldrich",
+            "catalog_number": combined["catalog"],
+            "pack_size": combined["size"],
+            "purity": combined["purity"],
+            "grade": combined["grade"],
+            "base_price": (combined["unit_price"] * combined["multiplier"]).round(2),
+            "weight_kg": self._pack_sizes_to_kg(combined["size"]),
+            "cas_number": self._generate_cas_numbers(len(combined)),
+            "is_hazardous": (combined["category"] == "chemicals") & (_RNG.random(len(combined)) > 0.4),
+            "storage_temp": combined["category"].map(self._get_storage_temperature),
+            "data_source": "Sigma-Aldrich Real Catalog"
+        })
         
         print(f"✅ Retrieved {len(products)} real Sigma-Aldrich products")
-        return pd.DataFrame(products)
+        return products
     
+    @parquet_cache
     def fetch_biorad_equipment(self, limit=100):
         """Fetch real Bio-Rad laboratory equipment"""
         print("🧬 Fetching real Bio-Rad equipment catalog...")
         
-        products = []
-        
         # Real Bio-Rad product lines
         biorad_equipment = [
             {"name": "C1000 Touch Thermal Cycler", "category": "pcr", "price": 8500, "weight": 12.5},
@@ -197,34 +269,36 @@ class LifeSciencesCatalogIntegrator:
             {"name": "4-20% Mini-PROTEAN TGX Gels", "category": "consumables", "price": 65, "weight": 0.15}
         ]
         
-        for equipment in biorad_equipment:
-            # Generate multiple models/configurations
-            for i in range(random.randint(2, 5)):
-                model_suffix = random.choice(["", " with Gradient", " Bundle", " Starter Pack", " Educational"])
-                
-                products.append({
-                    "sku": f"BR{random.randint(1000000, 9999999)}",
-                    "product_name": f"{equipment['name']}{model_suffix}",
-                    "category": "lab_equipment",
-                    "subcategory": equipment["category"],
-                    "supplier": "Bio-Rad",
-                    "brand": "Bio-Rad",
-                    "base_price": round(equipment["price"] * random.uniform(0.9, 1.3), 2),
-                    "weight_kg": round(equipment["weight"] * random.uniform(0.8, 1.2), 2),
-                    "warranty_years": random.choice([1, 2, 3]),
-                    "power_requirements": f"{random.randint(100, 240)}V, {random.randint(50, 60)}Hz",
-                    "data_source": "Bio-Rad Real Catalog"
-                })
+        # Generate multiple models/configurations: repeat each piece of equipment 2-5 times
+        catalog = pd.DataFrame(biorad_equipment)
+        model_counts = _RNG.integers(2, 6, size=len(catalog))
+        models = catalog.iloc[np.repeat(np.arange(len(catalog)), model_counts)].reset_index(drop=True)
+        n = len(models)
+        model_suffixes = np.array(["", " with Gradient", " Bundle", " Starter Pack", " Educational"])[_RNG.integers(0, 5, size=n)]
+        
+        products = pd.DataFrame({
+            "sku": random_skus(_RNG, "BR", 7, n),
+            "product_name": models["name"] + model_suffixes,
+            "category": "lab_equipment",
+            "subcategory": models["category"],
+            "supplier": "Bio-Rad",
+            "brand": "Bio-Rad",
+            "base_price": (models["price"] * _RNG.uniform(0.9, 1.3, size=n)).round(2),
+            "weight_kg": (models["weight"] * _RNG.uniform(0.8, 1.2, size=n)).round(2),
+            "warranty_years": _RNG.choice([1, 2, 3], size=n),
+            "power_requirements": np.char.add(np.char.mod("%dV, ", _RNG.integers(100, 241, size=n)),
+                                              np.char.mod("%dHz", _RNG.integers(50, 61, size=n))),
+            "data_source": "Bio-Rad Real Catalog"
+        })
         
         print(f"✅ Retrieved {len(products)} Bio-Rad products")
-        return pd.DataFrame(products)
+        return products
     
+    @parquet_cache
     def fetch_eppendorf_products(self, limit=100):
         """Fetch real Eppendorf liquid handling equipment"""
         print("💧 Fetching real Eppendorf products...")
         
-        products = []
-        
         # Real Eppendorf product lines
         eppendorf_products = [
             {"name": "Research plus Pipette", "volume": "0.1-2.5 µL", "price": 285, "weight": 0.1},
@@ -239,40 +313,47 @@ class LifeSciencesCatalogIntegrator:
             {"name": "epTIPS Pipette Tips", "volume": "0.1-10 µL", "price": 85, "weight": 0.05}
         ]
         
-        for product in eppendorf_products:
-            # Generate different configurations
-            configurations = ["Standard", "Starter Kit", "Complete Set", "Refurbished"]
-            
-            for config in configurations[:random.randint(1, 3)]:
-                price_multiplier = {"Standard": 1.0, "Starter Kit": 1.2, "Complete Set": 1.5, "Refurbished": 0.7}
-                
-                products.append({
-                    "sku": f"EP{random.randint(100000, 999999)}",
-                    "product_name": f"{product['name']} {product['volume']} - {config}",
-                    "category": "lab_equipment",
-                    "subcategory": "liquid_handling",
-                    "supplier": "Eppendorf",
-                    "brand": "Eppendorf",
-                    "volume_range": product["volume"],
-                    "base_price": round(product["price"] * price_multiplier[config], 2),
-                    "weight_kg": round(product["weight"], 3),
-                    "precision": "±0.6%" if "Pipette" in product["name"] else "N/A",
-                    "autoclavable": random.choice([True, False]),
-                    "data_source": "Eppendorf Real Catalog"
-                })
+        # Generate different configurations: each product is offered in its first 1-3
+        catalog = pd.DataFrame(eppendorf_products)
+        config_counts = _RNG.integers(1, 4, size=len(catalog))
+        configured = catalog.iloc[np.repeat(np.arange(len(catalog)), config_counts)].reset_index(drop=True)
+        # Position of each row within its product's run of configurations
+        config_idx = np.arange(len(configured)) - np.repeat(np.cumsum(config_counts) - config_counts, config_counts)
+        n = len(configured)
+        
+        products = pd.DataFrame({
+            "sku": random_skus(_RNG, "EP", 6, n),
+            "product_name": configured["name"] + " " + configured["volume"] + " - " + EPPENDORF_CONFIGURATIONS[config_idx],
+            "category": "lab_equipment",
+            "subcategory": "liquid_handling",
+            "supplier": "Eppendorf",
+            "brand": "Eppendorf",
+            "volume_range": configured["volume"],
+            "base_price": (configured["price"] * EPPENDORF_PRICE_MULTIPLIERS[config_idx]).round(2),
+            "weight_kg": configured["weight"].round(3),
+            "precision": np.where(configured["name"].str.contains("Pipette", regex=False), "±0.6%", "N/A"),
+            "autoclavable": _RNG.random(n) < 0.5,
+            "data_source": "Eppendorf Real Catalog"
+        })
         
         print(f"✅ Retrieved {len(products)} Eppendorf products")
-        return pd.DataFrame(products)
+        return products
     
     def integrate_real_lifesciences_data(self):
         """Integrate all real life sciences product catalogs"""
         print("\n🧪 === INTEGRATING REAL LIFE SCIENCES PRODUCT CATALOGS ===\n")
         
-        # Fetch from all major suppliers
-        thermo_products = self.fetch_thermo_fisher_products(200)
-        sigma_products = self.fetch_sigma_aldrich_products(150)
-        biorad_products = self.fetch_biorad_equipment(80)
-        eppendorf_products = self.fetch_eppendorf_products(70)
+        # Fetch from all major suppliers; the catalogs are independent, so fetch
+        # them concurrently and let rate-limit pauses overlap
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            thermo_future = executor.submit(self.fetch_thermo_fisher_products, 200)
+            sigma_future = executor.submit(self.fetch_sigma_aldrich_products, 150)
+            biorad_future = executor.submit(self.fetch_biorad_equipment, 80)
+            eppendorf_future = executor.submit(self.fetch_eppendorf_products, 70)
+            thermo_products = thermo_future.result()
+            sigma_products = sigma_future.result()
+            biorad_products = biorad_future.result()
+            eppendorf_products = eppendorf_future.result()
         
         # Standardize column names across all catalogs
         all_products = []
@@ -286,8 +367,10 @@ class LifeSciencesCatalogIntegrator:
             standardized = self._standardize_product_data(df, supplier)
             all_products.append(standardized)
         
-        # Combine all catalogs
-        combined_catalog = pd.concat(all_products, ignore_index=True)
+        # Combine all catalogs; reindex each to the shared schema (columns in first-seen
+        # order) up front so concat stacks aligned frames instead of aligning pairwise
+        all_columns = list(dict.fromkeys(col for df in all_products for col in df.columns))
+        combined_catalog = pd.concat([df.reindex(columns=all_columns) for df in all_products], ignore_index=True)
         
         # Add standardized fields
         combined_catalog = self._add_standard_fields(combined_catalog)
@@ -295,19 +378,28 @@ class LifeSciencesCatalogIntegrator:
         # Generate realistic transactions based on real products
         transactions = self._generate_realistic_transactions(combined_catalog, 8000)
         
-        # Save data
-        combined_catalog.to_csv(f"{self.base_path}/real_lifesciences_products.csv", index=False)
-        transactions.to_csv(f"{self.base_path}/real_lifesciences_transactions.csv", index=False)
-        
-        print(f"\n✅ === REAL LIFE SCIENCES DATA INTEGRATION COMPLETE ===")
-        print(f"🔬 Thermo Fisher: {len(thermo_products)} products")
-        print(f"⚗️ Sigma-Aldrich: {len(sigma_products)} products")
-        print(f"🧬 Bio-Rad: {len(biorad_products)} products")
-        print(f"💧 Eppendorf: {len(eppendorf_products)} products")
-        print(f"📦 Total Products: {len(combined_catalog):,}")
-        print(f"💰 Total Transactions: {len(transactions):,}")
-        print(f"💵 Total Revenue: ${transactions['total_amount'].sum():,.2f}")
-        print(f"📈 Price Range: ${combined_catalog['base_price'].min():.2f} - ${combined_catalog['base_price'].max():.2f}")
+        # Save data as CSV, plus Parquet copies when pyarrow is installed
+        outputs = {
+            "real_lifesciences_products": combined_catalog,
+            "real_lifesciences_transactions": transactions
+        }
+        # Both outputs are written on background threads while the summary is computed
+        with ThreadPoolExecutor(max_workers=len(outputs)) as io_pool:
+            writes = [io_pool.submit(save_output, df, self.base_path, name) for name, df in outputs.items()]
+            
+            print(f"\n✅ === REAL LIFE SCIENCES DATA INTEGRATION COMPLETE ===")
+            print(f"🔬 Thermo Fisher: {len(thermo_products)} products")
+            print(f"⚗️ Sigma-Aldrich: {len(sigma_products)} products")
+            print(f"🧬 Bio-Rad: {len(biorad_products)} products")
+            print(f"💧 Eppendorf: {len(eppendorf_products)} products")
+            print(f"📦 Total Products: {len(combined_catalog):,}")
+            print(f"💰 Total Transactions: {len(transactions):,}")
+            print(f"💵 Total Revenue: ${transactions['total_amount'].sum():,.2f}")
+            print(f"📈 Price Range: ${combined_catalog['base_price'].min():.2f} - ${combined_catalog['base_price'].max():.2f}")
+        
+        # Surface any write error
+        for write in writes:
+            write.result()
         
         return {
             "products": combined_catalog,
@@ -323,8 +415,6 @@ class LifeSciencesCatalogIntegrator:
     # Helper methods
     def _generate_realistic_thermo_fisher_catalog(self, limit):
         """Generate realistic Thermo Fisher products based on real catalog structure"""
-        products = []
-        
         real_thermo_products = [
             # Lab Equipment
             {"name": "Sorvall LYNX 4000 Superspeed Centrifuge", "category": "lab_equipment", "price": 45000, "weight": 95.0},
@@ -344,26 +434,29 @@ class LifeSciencesCatalogIntegrator:
             {"name": "Matrix 2D Barcoded Tubes", "category": "consumables", "price": 195, "weight": 0.3}
         ]
         
-        for product in real_thermo_products:
-            for i in range(random.randint(3, 8)):
-                variant = random.choice(["Standard", "Educational", "Research", "Clinical", "Bulk"])
-                
-                products.append({
-                    "sku": f"TF{random.randint(1000000, 9999999)}",
-                    "product_name": f"{product['name']} - {variant}",
-                    "category": product["category"],
-                    "supplier": "Thermo Fisher Scientific",
-                    "brand": "Thermo Scientific",
-                    "base_price": round(product["price"] * random.uniform(0.85, 1.25), 2),
-                    "weight_kg": round(product["weight"] * random.uniform(0.8, 1.3), 3),
-                    "data_source": "Thermo Fisher Real Catalog"
-                })
-        
-        return products[:limit]
+        # Each real product appears in 3-8 variants; repeat its row once per variant
+        catalog = pd.DataFrame(real_thermo_products)
+        variant_counts = _RNG.integers(3, 9, size=len(catalog))
+        products = catalog.iloc[np.repeat(np.arange(len(catalog)), variant_counts)].reset_index(drop=True)
+        n = len(products)
+        variants = np.array(["Standard", "Educational", "Research", "Clinical", "Bulk"])[_RNG.integers(0, 5, size=n)]
+        
+        return pd.DataFrame({
+            "sku": random_skus(_RNG, "TF", 7, n),
+            "product_name": products["name"] + " - " + variants,
+            "category": products["category"],
+            "supplier": "Thermo Fisher Scientific",
+            "brand": "Thermo Scientific",
+            "base_price": (products["price"] * _RNG.uniform(0.85, 1.25, size=n)).round(2),
+            "weight_kg": (products["weight"] * _RNG.uniform(0.8, 1.3, size=n)).round(3),
+            "data_source": "Thermo Fisher Real Catalog"
+        }).head(limit)
     
     def _standardize_product_data(self, df, supplier):
         """Standardize product data across different supplier formats"""
-        standardized = df.copy()
+        # Shallow copy: column additions below must not leak into the supplier frames
+        # returned to the caller, but there is no need to duplicate their data
+        standardized = df.copy(deep=False)
         
         # Ensure required columns exist
         required_columns = ['sku', 'product_name', 'category', 'supplier', 'base_price', 'weight_kg']
@@ -371,7 +464,7 @@ class LifeSciencesCatalogIntegrator:
         for col in required_columns:
             if col not in standardized.columns:
                 if col == 'sku':
-                    standardized[col] = [f"{supplier[:2].upper()}{i:06d}" for i in range(len(standardized))]
+                    standardized[col] = np.char.mod(f"{supplier[:2].upper()}%06d", np.arange(len(standardized)))
                 elif col == 'supplier':
                     standardized[col] = supplier
                 elif col == 'base_price':
@@ -384,9 +477,7 @@ class LifeSciencesCatalogIntegrator:
         return standardized
     
     def _add_standard_fields(self, df):
-        """Add standardized fields to combined catalog"""
-        df = df.copy()
-        
+        """Add standardized fields to combined catalog (df is modified in place)"""
         # Add HS codes for international shipping
         hs_code_mapping = {
             "lab_equipment": "9027.80.45",
@@ -397,106 +488,95 @@ class LifeSciencesCatalogIntegrator:
         }
         
         df["hs_code"] = df["category"].map(hs_code_mapping).fillna("9027.90.00")
-        df["country_of_origin"] = df["supplier"].apply(self._get_country_of_origin)
-        df["lead_time_days"] = df["category"].apply(self._get_lead_time)
-        df["minimum_order_quantity"] = df["category"].apply(self._get_moq)
+        df["country_of_origin"] = df["supplier"].map(SUPPLIER_ORIGINS).fillna("USA")
+        
+        # Lead times are drawn per product within the category's range (7 days otherwise)
+        lead_time_low = df["category"].map({category: low for category, (low, _) in LEAD_TIME_RANGES.items()}).fillna(7)
+        lead_time_high = df["category"].map({category: high for category, (_, high) in LEAD_TIME_RANGES.items()}).fillna(7)
+        df["lead_time_days"] = _RNG.integers(lead_time_low.to_numpy(dtype=np.int64),
+                                             lead_time_high.to_numpy(dtype=np.int64) + 1)
+        
+        # Consumables are sold in multiples of 1, 5 or 10; everything else singly
+        df["minimum_order_quantity"] = np.where(df["category"] == "consumables",
+                                                _RNG.choice([1, 5, 10], size=len(df)), 1)
         
-        return df
+        # Store repeated labels as category codes
+        return df.astype({col: 'category' for col in CATALOG_CATEGORICAL_COLUMNS if col in df})
     
     def _generate_realistic_transactions(self, products_df, num_transactions):
         """Generate realistic transactions using real product data"""
-        transactions = []
-        
-        # Real customer segments in life sciences
-        customer_segments = {
-            "Academic": {"price_sensitivity": 0.85, "volume_preference": "small"},
-            "Biotech Startup": {"price_sensitivity": 0.92, "volume_preference": "medium"},
-            "Pharma Enterprise": {"price_sensitivity": 1.15, "volume_preference": "large"},
-            "Research Institute": {"price_sensitivity": 0.88, "volume_preference": "medium"},
-            "CRO": {"price_sensitivity": 1.05, "volume_preference": "large"},
-            "Government Lab": {"price_sensitivity": 0.82, "volume_preference": "small"}
-        }
-        
-        for i in range(num_transactions):
-            product = products_df.sample(n=1).iloc[0]
-            segment = random.choice(list(customer_segments.keys()))
-            segment_data = customer_segments[segment]
-            
-            # Determine quantity based on segment
-            if segment_data["volume_preference"] == "small":
-                quantity = random.choices([1, 2, 3, 5], weights=[0.5, 0.3, 0.15, 0.05])[0]
-            elif segment_data["volume_preference"] == "medium":
-                quantity = random.choices([1, 2, 5, 10, 25], weights=[0.2, 0.3, 0.3, 0.15, 0.05])[0]
-            else:
-                quantity = random.choices([5, 10, 25, 50, 100], weights=[0.1, 0.2, 0.4, 0.2, 0.1])[0]
-            
-            # Apply pricing
-            unit_price = product["base_price"] * segment_data["price_sensitivity"]
-            unit_price *= random.uniform(0.95, 1.08)  # Market variation
-            
-            # Volume discounts
-            if quantity >= 25:
-                unit_price *= 0.88
-            elif quantity >= 10:
-                unit_price *= 0.92
-            elif quantity >= 5:
-                unit_price *= 0.96
-            
-            transaction_date = datetime.now() - timedelta(days=random.randint(0, 730))
-            
-            transactions.append({
-                "transaction_id": f"LS{i+1:06d}",
-                "date": transaction_date.strftime("%Y-%m-%d"),
-                "customer_id": f"{segment[:3].upper()}{random.randint(1000, 9999)}",
-                "segment": segment,
-                "sku": product["sku"],
-                "product_name": product["product_name"],
-                "category": product["category"],
-                "supplier": product["supplier"],
-                "quantity": quantity,
-                "unit_price": round(unit_price, 2),
-                "base_price": product["base_price"],
-                "total_amount": round(unit_price * quantity, 2),
-                "weight_kg": product["weight_kg"] * quantity,
-                "hs_code": product.get("hs_code", "9027.90.00"),
-                "country_of_origin": product.get("country_of_origin", "USA"),
-                "is_real_product": True
-            })
-        
-        return pd.DataFrame(transactions)
+        n = num_transactions
+        
+        # Draw every transaction's product (as positions into the catalog) and segment up
+        # front; only the catalog columns a transaction carries are gathered
+        product_columns = [col for col in TRANSACTION_PRODUCT_COLUMNS if col in products_df.columns]
+        products = products_df[product_columns].take(_RNG.integers(0, len(products_df), size=n)).reset_index(drop=True)
+        segment_idx = _RNG.integers(0, len(SEGMENT_NAMES), size=n)
+        
+        # Determine quantity based on segment
+        volume_preferences = SEGMENT_VOLUME_PREFERENCE[segment_idx]
+        quantities = np.empty(n, dtype=np.int64)
+        for preference, (choices, weights) in enumerate(VOLUME_QUANTITY_OPTIONS):
+            mask = volume_preferences == preference
+            quantities[mask] = _RNG.choice(choices, size=mask.sum(), p=weights)
+        
+        # Apply pricing: segment sensitivity, market variation and volume discounts
+        discounts = np.select([quantities >= 25, quantities >= 10, quantities >= 5], [0.88, 0.92, 0.96], default=1.0)
+        unit_prices = (products["base_price"].to_numpy(dtype=np.float64) * SEGMENT_PRICE_SENSITIVITY[segment_idx]
+                       * _RNG.uniform(0.95, 1.08, size=n) * discounts)
+        totals = unit_prices * quantities
+        
+        transaction_dates = pd.Timestamp.now() - pd.to_timedelta(_RNG.integers(0, 731, size=n), unit="D")
+        
+        return pd.DataFrame({
+            "transaction_id": np.char.mod("LS%06d", np.arange(1, n + 1)),
+            "date": transaction_dates.strftime("%Y-%m-%d"),
+            "customer_id": np.char.add(SEGMENT_PREFIXES[segment_idx], np.char.mod("%d", _RNG.integers(1000, 10000, size=n))),
+            "segment": pd.Categorical.from_codes(segment_idx, SEGMENT_NAMES),
+            "sku": products["sku"],
+            "product_name": products["product_name"],
+            "category": products["category"],
+            "supplier": products["supplier"],
+            "quantity": quantities,
+            "unit_price": np.round(unit_prices, 2),
+            "base_price": products["base_price"],
+            "total_amount": np.round(totals, 2),
+            "weight_kg": products["weight_kg"] * quantities,
+            "hs_code": products.get("hs_code", "9027.90.00"),
+            "country_of_origin": products.get("country_of_origin", "USA"),
+            "is_real_product": True
+        })
     
     # Utility methods
-    def _estimate_sigma_price(self, product_name, category):
-        """Estimate Sigma-Aldrich prices based on product type"""
-        base_prices = {
-            "chemicals": 45,
-            "reagents": 125,
-            "biochemicals": 285
-        }
-        
-        base = base_prices.get(category, 75)
+    def _estimate_sigma_prices(self, names, categories):
+        """Estimate Sigma-Aldrich prices based on product type, for Series of names and categories"""
+        base = categories.map(SIGMA_BASE_PRICES).fillna(75).to_numpy()
         
         # Premium products cost more
-        if any(term in product_name.lower() for term in ["atp", "nadh", "antibody", "enzyme"]):
-            base *= 3
-        elif "chromatography" in product_name.lower() or "hplc" in product_name.lower():
-            base *= 2
+        multiplier = np.select(
+            [names.str.contains(SIGMA_PREMIUM_PATTERN), names.str.contains(SIGMA_CHROMATOGRAPHY_PATTERN)],
+            [3.0, 2.0],
+            default=1.0
+        )
         
-        return base * random.uniform(0.7, 1.8)
+        return base * multiplier * _RNG.uniform(0.7, 1.8, size=len(names))
     
-    def _convert_pack_size_to_kg(self, pack_size):
-        """Convert pack size string to kg"""
-        if "g" in pack_size.lower():
-            amount = float(re.findall(r'\d+', pack_size)[0])
-            if "kg" in pack_size.lower():
-                return amount
-            else:  # grams
-                return amount / 1000
-        return 0.001  # Default 1g
+    def _pack_sizes_to_kg(self, pack_sizes):
+        """Convert a Series of pack size strings to kg"""
+        amounts = pack_sizes.str.extract(r'(\d+)', expand=False).astype(float).to_numpy()
+        units = pack_sizes.str.lower()
+        return np.select(
+            [units.str.contains("kg", regex=False), units.str.contains("g", regex=False)],
+            [amounts, amounts / 1000],  # kg as-is, grams converted
+            default=0.001  # Default 1g
+        )
     
-    def _generate_cas_number(self):
-        """Generate realistic CAS registry numbers"""
-        return f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1, 9)}"
+    def _generate_cas_numbers(self, n):
+        """Generate n realistic CAS registry numbers"""
+        return np.char.add(
+            np.char.mod("%d-", _RNG.integers(100, 1000, size=n)),
+            np.char.add(np.char.mod("%d-", _RNG.integers(10, 100, size=n)), np.char.mod("%d", _RNG.integers(1, 10, size=n)))
+        )
     
     def _get_storage_temperature(self, category):
         """Get appropriate storage temperature for category"""
@@ -506,37 +586,7 @@ class LifeSciencesCatalogIntegrator:
             "biochemicals": "-20°C"
         }
         return storage_temps.get(category, "Room Temperature")
-    
-    def _get_country_of_origin(self, supplier):
-        """Get country of origin based on supplier"""
-        origins = {
-            "Thermo Fisher Scientific": "USA",
-            "Sigma-Aldrich": "Germany",
-            "Bio-Rad": "USA",
-            "Eppendorf": "Germany"
-        }
-        return origins.get(supplier, "USA")
-    
-    def _get_lead_time(self, category):
-        """Get typical lead time for product category"""
-        lead_times = {
-            "lab_equipment": random.randint(14, 45),
-            "reagents": random.randint(3, 14),
-            "chemicals": random.randint(5, 21),
-            "consumables": random.randint(1, 7)
-        }
-        return lead_times.get(category, 7)
-    
-    def _get_moq(self, category):
-        """Get minimum order quantity for category"""
-        moqs = {
-            "lab_equipment": 1,
-            "reagents": 1,
-            "chemicals": 1,
-            "consumables": random.choice([1, 5, 10])
-        }
-        return moqs.get(category, 1)
 
 if __name__ == "__main__":
-    integrator = LifeSciencesCatalogIntegrator()
-    data = integrator.integrate_real_lifesciences_data()
+    with LifeSciencesCatalogIntegrator() as integrator:
+        data = integrator.integrate_real_lifesciences_data()
@@ -8,10 +8,43 @@ import numpy as np
 import requests
 import json
 import time
-from datetime import datetime, timedelta
-import random
 import os
 
+from data_io import parquet_cache, random_skus, save_output
+
+# Compact dtypes for the saved datasets: float32 measures, categorical low-cardinality text
+PRODUCT_DTYPES = {"category": "category", "supplier": "category", "brand": "category",
+                  "base_price": "float32", "weight_kg": "float32"}
+TRANSACTION_DTYPES = {"segment": "category", "category": "category", "supplier": "category",
+                      "brand": "category", "shipping_zone": "category", "quantity": "int32",
+                      "unit_price": "float32", "base_price": "float32", "weight_kg": "float32"}
+
+# Seed for the integrator's random generator, so regenerated data is reproducible
+SEED = 42
+
+# Real customer segments in life sciences, indexed by segment id
+SEGMENT_NAMES = np.array(["Academic", "Biotech Startup", "Pharma Enterprise",
+                          "Research Institute", "CRO", "Government Lab"])
+SEGMENT_PRICE_SENSITIVITY = np.array([0.85, 0.92, 1.15, 0.88, 1.05, 0.82])
+SEGMENT_VOLUME_PREFERENCE = np.array([0, 1, 2, 1, 2, 0])  # small, medium, large
+SEGMENT_PREFIXES = np.array([name[:3].upper() for name in SEGMENT_NAMES])
+# Academic/Research prefer Q1 and Q4 (funding cycles); other segments are flat.
+# Rows are segment ids, columns are months
+_SEASONAL_MONTH_WEIGHTS = np.array([1.5, 1.2, 1.8, 1.6, 0.8, 0.6, 0.5, 0.7, 1.4, 1.6, 1.4, 1.8])
+SEGMENT_MONTH_WEIGHTS = np.where(np.array([True, False, False, True, False, True])[:, None],
+                                 _SEASONAL_MONTH_WEIGHTS, 1.0)
+# Quantity choices and weights for each volume preference
+VOLUME_QUANTITY_OPTIONS = [
+    ([1, 2, 3, 5], [0.5, 0.3, 0.15, 0.05]),
+    ([1, 2, 5, 10, 25], [0.2, 0.3, 0.3, 0.15, 0.05]),
+    ([5, 10, 25, 50, 100], [0.1, 0.2, 0.4, 0.2, 0.1])
+]
+# Volume discounts: quantities at or above each break get the next factor
+VOLUME_DISCOUNT_BREAKS = np.array([5, 10, 25])
+VOLUME_DISCOUNT_FACTORS = np.array([1.0, 0.96, 0.92, 0.88])
+SHIPPING_ZONE_NAMES = np.array(["Zone 2", "Zone 3", "Zone 4", "Zone 5", "Zone 6", "Zone 7", "Zone 8", "Canada", "Europe"])
+SHIPPING_ZONE_WEIGHTS = [0.25, 0.2, 0.15, 0.12, 0.1, 0.08, 0.05, 0.03, 0.02]
+
 class LifeSciencesDataIntegrator:
     """
     Integrates real-world data sources for life sciences e-commerce:
@@ -21,18 +54,21 @@ class LifeSciencesDataIntegrator:
     4. Real transaction patterns from retail datasets
     """
     
-    def __init__(self):
+    def __init__(self, seed=SEED):
         self.base_path = "data/real_world"
+        self.seed = seed
+        # Transactions draw from their own stream, so they come out the same whether
+        # the catalogs were regenerated or read back from the Parquet cache
+        self.rng, self.transaction_rng = np.random.default_rng(seed).spawn(2)
         os.makedirs(self.base_path, exist_ok=True)
         
+    @parquet_cache
     def fetch_thermo_fisher_catalog(self, limit=100):
         """Fetch real Thermo Fisher Scientific product data"""
         print("🔬 Fetching Thermo Fisher Scientific catalog data...")
         
         # Simulate API calls to Thermo Fisher catalog
         # In production, would use their API or scrape public catalog
-        thermo_products = []
-        
         # Real Thermo Fisher product categories and typical products
         categories = {
             "lab_equipment": [
@@ -65,36 +101,35 @@ class LifeSciencesDataIntegrator:
             ]
         }
         
-        # Generate products with real Thermo Fisher naming conventions
-        for category, products in categories.items():
-            for prod_type, name, base_price, weight in products:
-                for i in range(random.randint(3, 8)):  # Multiple SKUs per product type
-                    sku = f"TF{category[:3].upper()}{random.randint(10000, 99999)}"
-                    
-                    # Add realistic variations
-                    price_variation = random.uniform(0.8, 1.4)
-                    weight_variation = random.uniform(0.7, 1.5)
-                    
-                    thermo_products.append({
-                        "sku": sku,
-                        "product_name": f"{name} - {random.choice(['1 Unit', '5 Pack', '10 Pack', 'Bulk'])}",
-                        "category": category,
-                        "supplier": "Thermo Fisher Scientific",
-                        "base_price": round(base_price * price_variation, 2),
-                        "weight_kg": round(weight * weight_variation, 3),
-                        "brand": "Thermo Scientific",
-                        "catalog_number": f"TF{random.randint(100000, 999999)}",
-                        "hazardous": category == "chemicals" and random.random() > 0.7
-                    })
+        # Generate products with real Thermo Fisher naming conventions: one catalog row per
+        # product type, repeated once per SKU (3-8 each), truncated to the limit up front
+        catalog = pd.DataFrame(
+            [(category, *product) for category, products in categories.items() for product in products],
+            columns=["category", "prod_type", "name", "base_price", "weight"]
+        )
+        sku_counts = self.rng.integers(3, 9, size=len(catalog))
+        products = catalog.iloc[np.repeat(np.arange(len(catalog)), sku_counts)[:limit]].reset_index(drop=True)
+        n = len(products)
+        pack_sizes = np.array(['1 Unit', '5 Pack', '10 Pack', 'Bulk'])[self.rng.integers(0, 4, size=n)]
         
-        return pd.DataFrame(thermo_products[:limit])
+        return pd.DataFrame({
+            "sku": random_skus(self.rng, np.char.add("TF", np.char.upper(products["category"].to_numpy().astype("U3"))), 5, n),
+            "product_name": products["name"] + " - " + pack_sizes,
+            "category": products["category"],
+            "supplier": "Thermo Fisher Scientific",
+            # Realistic price and weight variations
+            "base_price": (products["base_price"] * self.rng.uniform(0.8, 1.4, size=n)).round(2),
+            "weight_kg": (products["weight"] * self.rng.uniform(0.7, 1.5, size=n)).round(3),
+            "brand": "Thermo Scientific",
+            "catalog_number": random_skus(self.rng, "TF", 6, n),
+            "hazardous": (products["category"] == "chemicals") & (self.rng.random(n) > 0.7)
+        }, copy=False)
     
+    @parquet_cache
     def fetch_sigma_aldrich_catalog(self, limit=100):
         """Fetch real Sigma-Aldrich/Merck product data"""
         print("⚗️ Fetching Sigma-Aldrich catalog data...")
         
-        sigma_products = []
-        
         # Real Sigma-Aldrich product lines
         categories = {
             "chemicals": [
@@ -120,29 +155,32 @@ class LifeSciencesDataIntegrator:
             ]
         }
         
-        for category, products in categories.items():
-            for prod_type, name, base_price, weight in products:
-                for i in range(random.randint(4, 10)):
-                    sku = f"SA{random.randint(100000, 999999)}"
-                    
-                    price_variation = random.uniform(0.85, 1.3)
-                    weight_variation = random.uniform(0.8, 1.4)
-                    
-                    sigma_products.append({
-                        "sku": sku,
-                        "product_name": f"{prod_type} - {name}",
-                        "category": category,
-                        "supplier": "Sigma-Aldrich",
-                        "base_price": round(base_price * price_variation, 2),
-                        "weight_kg": round(weight * weight_variation, 3),
-                        "brand": "Sigma-Aldrich",
-                        "cas_number": f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1, 9)}",
-                        "purity": f"{random.randint(95, 99)}.{random.randint(0, 9)}%",
-                        "hazardous": random.random() > 0.6
-                    })
+        # One catalog row per product line, repeated once per SKU (4-10 each)
+        catalog = pd.DataFrame(
+            [(category, *product) for category, products in categories.items() for product in products],
+            columns=["category", "prod_type", "name", "base_price", "weight"]
+        )
+        sku_counts = self.rng.integers(4, 11, size=len(catalog))
+        products = catalog.iloc[np.repeat(np.arange(len(catalog)), sku_counts)[:limit]].reset_index(drop=True)
+        n = len(products)
         
-        return pd.DataFrame(sigma_products[:limit])
+        return pd.DataFrame({
+            "sku": random_skus(self.rng, "SA", 6, n),
+            "product_name": products["prod_type"] + " - " + products["name"],
+            "category": products["category"],
+            "supplier": "Sigma-Aldrich",
+            "base_price": (products["base_price"] * self.rng.uniform(0.85, 1.3, size=n)).round(2),
+            "weight_kg": (products["weight"] * self.rng.uniform(0.8, 1.4, size=n)).round(3),
+            "brand": "Sigma-Aldrich",
+            "cas_number": np.char.add(
+                np.char.mod("%d-", self.rng.integers(100, 1000, size=n)),
+                np.char.add(np.char.mod("%d-", self.rng.integers(10, 100, size=n)), np.char.mod("%d", self.rng.integers(1, 10, size=n)))
+            ),
+            "purity": np.char.add(np.char.mod("%d.", self.rng.integers(95, 100, size=n)), np.char.mod("%d%%", self.rng.integers(0, 10, size=n))),
+            "hazardous": self.rng.random(n) > 0.6
+        }, copy=False)
     
+    @parquet_cache
     def fetch_hs_codes_and_tariffs(self):
         """Fetch real HS codes and tariff data for life sciences products"""
         print("📊 Fetching HS codes and tariff data...")
@@ -176,27 +214,28 @@ class LifeSciencesDataIntegrator:
             ]
         }
         
-        tariff_data = []
-        for category, codes in hs_codes.items():
-            for hs_code, description, tariff_rate in codes:
-                tariff_data.append({
-                    "hs_code": hs_code,
-                    "description": description,
-                    "category": category,
-                    "us_tariff_rate": tariff_rate,
-                    "eu_tariff_rate": tariff_rate * 0.8,  # EU typically lower
-                    "preferential_rate": max(0, tariff_rate - 2.0)
-                })
+        # One pass to split the table into columns, then derive the other rates with ufuncs
+        codes, descriptions, categories, rates = zip(*[
+            (hs_code, description, category, tariff_rate)
+            for category, entries in hs_codes.items() for hs_code, description, tariff_rate in entries
+        ])
+        us_rates = np.array(rates, dtype=np.float32)
         
-        return pd.DataFrame(tariff_data)
+        return pd.DataFrame({
+            "hs_code": codes,
+            "description": descriptions,
+            "category": pd.Categorical(categories),
+            "us_tariff_rate": us_rates,
+            "eu_tariff_rate": np.round(us_rates * np.float32(0.8), 2),  # EU typically lower
+            "preferential_rate": np.round(np.maximum(np.float32(0), us_rates - np.float32(2.0)), 2)
+        }, copy=False)
     
+    @parquet_cache
     def fetch_shipping_zones_and_rates(self):
         """Fetch real shipping zone data and rates"""
         print("🚚 Fetching shipping zones and rate data...")
         
         # Real UPS/FedEx zone structure
-        shipping_zones = []
-        
         # US Domestic zones (real UPS zones)
         us_zones = {
             "Zone 2": {"base_rate": 12.50, "per_kg": 2.85, "description": "Local (0-150 miles)"},
@@ -218,109 +257,80 @@ class LifeSciencesDataIntegrator:
         }
         
         # Combine all zones
-        for zone, data in {**us_zones, **intl_zones}.items():
-            shipping_zones.append({
-                "zone": zone,
-                "base_rate": data["base_rate"],
-                "per_kg_rate": data["per_kg"],
-                "duties_rate": data.get("duties_rate", 0.0),
-                "is_international": zone not in us_zones,
-                "transit_days": 1 if zone == "Zone 2" else (3 if zone.startswith("Zone") else 7)
-            })
+        all_zones = {**us_zones, **intl_zones}
+        zones = np.array(list(all_zones))
+        is_international = np.isin(zones, list(intl_zones))
         
-        return pd.DataFrame(shipping_zones)
+        return pd.DataFrame({
+            "zone": zones,
+            "base_rate": np.array([data["base_rate"] for data in all_zones.values()]),
+            "per_kg_rate": np.array([data["per_kg"] for data in all_zones.values()]),
+            "duties_rate": np.array([data.get("duties_rate", 0.0) for data in all_zones.values()]),
+            "is_international": is_international,
+            "transit_days": np.where(zones == "Zone 2", 1, np.where(is_international, 7, 3))
+        }, copy=False)
     
     def generate_realistic_transactions(self, products_df, num_transactions=5000):
         """Generate realistic transactions using real e-commerce patterns"""
         print(f"💰 Generating {num_transactions:,} realistic transactions...")
         
-        # Real customer segments in life sciences
-        customer_segments = {
-            "Academic": {"price_sensitivity": 0.85, "volume_preference": "small", "seasonal": True},
-            "Biotech Startup": {"price_sensitivity": 0.92, "volume_preference": "medium", "seasonal": False},
-            "Pharma Enterprise": {"price_sensitivity": 1.15, "volume_preference": "large", "seasonal": False},
-            "Research Institute": {"price_sensitivity": 0.88, "volume_preference": "medium", "seasonal": True},
-            "CRO": {"price_sensitivity": 1.05, "volume_preference": "large", "seasonal": False},
-            "Government Lab": {"price_sensitivity": 0.82, "volume_preference": "small", "seasonal": True}
-        }
+        n = num_transactions
+        start_date = pd.Timestamp.now().normalize() - pd.Timedelta(days=365*2)  # 2 years of data
+        
+        # Draw every candidate transaction's product, segment and date at once
+        product_idx = self.transaction_rng.integers(0, len(products_df), size=n)
+        segment_idx = self.transaction_rng.integers(0, len(SEGMENT_NAMES), size=n)
+        transaction_dates = start_date + pd.to_timedelta(self.transaction_rng.integers(0, 731, size=n), unit="D")
+        
+        # Skip some transactions based on seasonality; everything below is drawn and
+        # built only for the kept rows, which keep their candidate transaction numbers
+        month_weights = SEGMENT_MONTH_WEIGHTS[segment_idx, transaction_dates.month.to_numpy() - 1]
+        kept = np.flatnonzero(self.transaction_rng.random(n) <= month_weights / 2)
+        product_idx, segment_idx, transaction_dates = product_idx[kept], segment_idx[kept], transaction_dates[kept]
+        n = len(kept)
+        
+        # Determine quantity based on segment preference
+        volume_preferences = SEGMENT_VOLUME_PREFERENCE[segment_idx]
+        quantities = np.empty(n, dtype=np.int64)
+        for preference, (choices, weights) in enumerate(VOLUME_QUANTITY_OPTIONS):
+            mask = volume_preferences == preference
+            quantities[mask] = self.transaction_rng.choice(choices, size=mask.sum(), p=weights)
+        
+        # Gather product fields by position from the catalog's backing arrays, skipping
+        # the intermediate row frame; text/categorical columns keep their dtype via .array
+        base_prices = products_df["base_price"].to_numpy()[product_idx]
+        weights = products_df["weight_kg"].to_numpy()[product_idx]
+        products = {col: products_df[col].array.take(product_idx)
+                    for col in ("sku", "product_name", "category", "supplier", "brand") if col in products_df}
+        hazardous = products_df["hazardous"].to_numpy()[product_idx] if "hazardous" in products_df else False
         
-        transactions = []
-        start_date = datetime.now() - timedelta(days=365*2)  # 2 years of data
+        # Apply segment pricing with some market noise, then volume discounts
+        unit_prices = base_prices * SEGMENT_PRICE_SENSITIVITY[segment_idx]
+        unit_prices *= self.transaction_rng.uniform(0.95, 1.08, size=n)
+        unit_prices *= VOLUME_DISCOUNT_FACTORS[np.searchsorted(VOLUME_DISCOUNT_BREAKS, quantities, side="right")]
         
-        for i in range(num_transactions):
-            # Select random product
-            product = products_df.sample(n=1).iloc[0]
-            
-            # Select customer segment
-            segment = random.choice(list(customer_segments.keys()))
-            segment_data = customer_segments[segment]
-            
-            # Generate realistic transaction date with seasonality
-            if segment_data["seasonal"]:
-                # Academic/Research prefer Q1 and Q4 (funding cycles)
-                month_weights = [1.5, 1.2, 1.8, 1.6, 0.8, 0.6, 0.5, 0.7, 1.4, 1.6, 1.4, 1.8]
-            else:
-                month_weights = [1.0] * 12
-            
-            random_days = random.randint(0, 730)
-            transaction_date = start_date + timedelta(days=random_days)
-            month_weight = month_weights[transaction_date.month - 1]
-            
-            # Skip some transactions based on seasonality
-            if random.random() > month_weight / 2:
-                continue
-            
-            # Determine quantity based on segment preference
-            if segment_data["volume_preference"] == "small":
-                quantity = random.choices([1, 2, 3, 5], weights=[0.5, 0.3, 0.15, 0.05])[0]
-            elif segment_data["volume_preference"] == "medium":
-                quantity = random.choices([1, 2, 5, 10, 25], weights=[0.2, 0.3, 0.3, 0.15, 0.05])[0]
-            else:  # large
-                quantity = random.choices([5, 10, 25, 50, 100], weights=[0.1, 0.2, 0.4, 0.2, 0.1])[0]
-            
-            # Apply segment pricing
-            unit_price = product["base_price"] * segment_data["price_sensitivity"]
-            
-            # Add some market noise
-            unit_price *= random.uniform(0.95, 1.08)
-            
-            # Volume discounts
-            if quantity >= 25:
-                unit_price *= 0.88
-            elif quantity >= 10:
-                unit_price *= 0.92
-            elif quantity >= 5:
-                unit_price *= 0.96
-            
-            # Generate realistic customer ID
-            customer_id = f"{segment[:3].upper()}{random.randint(1000, 9999)}"
-            
-            # Calculate shipping zone and costs
-            shipping_zone = random.choices(
-                ["Zone 2", "Zone 3", "Zone 4", "Zone 5", "Zone 6", "Zone 7", "Zone 8", "Canada", "Europe"],
-                weights=[0.25, 0.2, 0.15, 0.12, 0.1, 0.08, 0.05, 0.03, 0.02]
-            )[0]
-            
-            transactions.append({
-                "transaction_id": f"TXN{i+1:06d}",
-                "date": transaction_date.strftime("%Y-%m-%d"),
-                "customer_id": customer_id,
-                "segment": segment,
-                "sku": product["sku"],
-                "product_name": product["product_name"],
-                "category": product["category"],
-                "supplier": product["supplier"],
-                "quantity": quantity,
-                "unit_price": round(unit_price, 2),
-                "base_price": product["base_price"],
-                "total_amount": round(unit_price * quantity, 2),
-                "shipping_zone": shipping_zone,
-                "weight_kg": product["weight_kg"] * quantity,
-                "brand": product.get("brand", product["supplier"]),
-                "is_hazardous": product.get("hazardous", False)
-            })
+        # Generate realistic customer IDs and shipping zones
+        customer_ids = np.char.add(SEGMENT_PREFIXES[segment_idx], np.char.mod("%d", self.transaction_rng.integers(1000, 10000, size=n)))
+        zones = SHIPPING_ZONE_NAMES[self.transaction_rng.choice(len(SHIPPING_ZONE_NAMES), size=n, p=SHIPPING_ZONE_WEIGHTS)]
         
-        return pd.DataFrame(transactions)
+        return pd.DataFrame({
+            "transaction_id": np.char.mod("TXN%06d", kept + 1),
+            "date": transaction_dates.strftime("%Y-%m-%d"),
+            "customer_id": customer_ids,
+            "segment": SEGMENT_NAMES[segment_idx],
+            "sku": products["sku"],
+            "product_name": products["product_name"],
+            "category": products["category"],
+            "supplier": products["supplier"],
+            "quantity": quantities,
+            "unit_price": np.round(unit_prices, 2),
+            "base_price": base_prices,
+            "total_amount": np.round(unit_prices * quantities, 2),
+            "shipping_zone": zones,
+            "weight_kg": weights * quantities,
+            "brand": products.get("brand", products["supplier"]),
+            "is_hazardous": hazardous
+        }, copy=False).astype(TRANSACTION_DTYPES)
     
     def integrate_all_data(self):
         """Integrate all real-world data sources"""
@@ -333,7 +343,7 @@ class LifeSciencesDataIntegrator:
         shipping_zones = self.fetch_shipping_zones_and_rates()
         
         # Combine product catalogs
-        all_products = pd.concat([thermo_products, sigma_products], ignore_index=True)
+        all_products = pd.concat([thermo_products, sigma_products], ignore_index=True).astype(PRODUCT_DTYPES)
         
         # Add HS codes to products
         category_hs_map = {
@@ -344,16 +354,20 @@ class LifeSciencesDataIntegrator:
             "biochemicals": "3822.00.10"
         }
         
-        all_products["hs_code"] = all_products["category"].map(category_hs_map)
+        # Gather HS codes by category code: categories outside the map get code -1,
+        # which lands on the trailing missing-value slot
+        category_codes = pd.Categorical(all_products["category"], categories=list(category_hs_map)).codes
+        hs_code_table = np.array(list(category_hs_map.values()) + [None], dtype=object)
+        all_products["hs_code"] = hs_code_table[category_codes]
         
         # Generate realistic transactions
         transactions = self.generate_realistic_transactions(all_products, 8000)
         
         # Save all datasets
-        all_products.to_csv(f"{self.base_path}/real_products.csv", index=False)
-        transactions.to_csv(f"{self.base_path}/real_transactions.csv", index=False)
-        hs_codes.to_csv(f"{self.base_path}/hs_codes_tariffs.csv", index=False)
-        shipping_zones.to_csv(f"{self.base_path}/shipping_zones.csv", index=False)
+        save_output(all_products, self.base_path, "real_products")
+        save_output(transactions, self.base_path, "real_transactions")
+        save_output(hs_codes, self.base_path, "hs_codes_tariffs")
+        save_output(shipping_zones, self.base_path, "shipping_zones")
         
         print(f"\n✅ === REAL DATA INTEGRATION COMPLETE ===")
         print(f"📦 Products: {len(all_products):,} (Thermo Fisher + Sigma-Aldrich)")
@@ -5,11 +5,27 @@ Tests all endpoints to verify the system is working correctly.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 API_BASE = "http://localhost:8000"
+REQUEST_TIMEOUT = 10
+
+# One pooled session for every probe, so connections are reused instead of
+# re-established per request; the pool covers all concurrent workers
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 # Sample data for testing
 sample_customer = {
@@ -60,38 +76,93 @@ sample_basket = {
     "destination_zip": "02142"
 }
 
+ENDPOINT_CHECKS = [
+    ("/", "GET", None, "Backend Health Check"),
+    ("/api/pricing/recommendations", "POST",
+     {"customer": sample_customer, "products": sample_products},
+     "Pricing Recommendations API"),
+    ("/api/pricing/customer-segments", "GET", None, "Customer Segments API"),
+    ("/api/shipping/estimate", "POST", sample_basket, "Shipping Cost Estimation API"),
+    ("/api/shipping/carriers", "GET", None, "Shipping Carriers API"),
+    ("/api/invoices/generate?include_promotions=true", "POST", sample_basket,
+     "Invoice Generation API"),
+    ("/api/invoices/template/academic", "GET", None, "Invoice Template API"),
+]
+
 def test_api_endpoint(url, method="GET", data=None, description=""):
     """Test a single API endpoint."""
+    return report_result(url, description, probe_endpoint(url, method, data))
+
+def probe_endpoint(url, method="GET", data=None):
+    """Issue a single request and return (status, body, error) without printing."""
     try:
-        print(f"\n🔍 Testing: {description}")
-        print(f"   URL: {url}")
-        
         if method == "GET":
-            response = requests.get(url, timeout=10)
+            response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
         elif method == "POST":
-            response = requests.post(url, json=data, timeout=10)
+            response = SESSION.post(url, json=data, timeout=REQUEST_TIMEOUT)
         
-        print(f"   Status: {response.status_code}")
+        body = response.json() if response.status_code == 200 else response.text
+        return response.status_code, body, None
         
-        if response.status_code == 200:
-            result = response.json()
-            print(f"   ✅ SUCCESS")
-            print(f"   Response: {json.dumps(result, indent=2)[:200]}...")
-            return True
-        else:
-            print(f"   ❌ FAILED - Status {response.status_code}")
-            print(f"   Error: {response.text}")
-            return False
-            
     except requests.exceptions.ConnectionError:
-        print(f"   ❌ CONNECTION FAILED - Server not running?")
-        return False
+        return None, None, "CONNECTION FAILED - Server not running?"
     except requests.exceptions.Timeout:
-        print(f"   ❌ TIMEOUT - Request took too long")
-        return False
+        return None, None, "TIMEOUT - Request took too long"
     except Exception as e:
-        print(f"   ❌ ERROR - {str(e)}")
+        return None, None, f"ERROR - {str(e)}"
+
+async def probe_endpoint_async(session, url, method="GET", data=None):
+    """aiohttp counterpart of probe_endpoint."""
+    try:
+        async with session.request(method, url, json=data) as response:
+            if response.status == 200:
+                body = await response.json()
+            else:
+                body = await response.text()
+            return response.status, body, None
+            
+    except aiohttp.ClientConnectionError:
+        return None, None, "CONNECTION FAILED - Server not running?"
+    except asyncio.TimeoutError:
+        return None, None, "TIMEOUT - Request took too long"
+    except Exception as e:
+        return None, None, f"ERROR - {str(e)}"
+
+def report_result(url, description, result):
+    """Print the outcome of one probe and return whether it passed."""
+    status, body, error = result
+    print(f"\n🔍 Testing: {description}")
+    print(f"   URL: {url}")
+    
+    if error:
+        print(f"   ❌ {error}")
         return False
+    
+    print(f"   Status: {status}")
+    
+    if status == 200:
+        print(f"   ✅ SUCCESS")
+        print(f"   Response: {json.dumps(body, indent=2)[:200]}...")
+        return True
+    else:
+        print(f"   ❌ FAILED - Status {status}")
+        print(f"   Error: {body}")
+        return False
+
+def run_checks(checks):
+    """Fire all endpoint checks concurrently; results come back in check order."""
+    if AIOHTTP_AVAILABLE:
+        async def run():
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                return await asyncio.gather(*[
+                    probe_endpoint_async(session, url, method, data)
+                    for url, method, data, _ in checks
+                ])
+        return asyncio.run(run())
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(lambda check: probe_endpoint(*check[:3]), checks))
 
 def main():
     """Run comprehensive API tests."""
@@ -100,58 +171,14 @@ def main():
     print("=" * 60)
     print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    tests = []
-    
-    # Test 1: Backend Health Check
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/",
-        description="Backend Health Check"
-    ))
-    
-    # Test 2: Pricing Recommendations
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/api/pricing/recommendations",
-        method="POST",
-        data={
-            "customer": sample_customer,
-            "products": sample_products
-        },
-        description="Pricing Recommendations API"
-    ))
-    
-    # Test 3: Customer Segments
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/api/pricing/customer-segments",
-        description="Customer Segments API"
-    ))
-    
-    # Test 4: Shipping Estimation
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/api/shipping/estimate",
-        method="POST",
-        data=sample_basket,
-        description="Shipping Cost Estimation API"
-    ))
-    
-    # Test 5: Shipping Carriers
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/api/shipping/carriers",
-        description="Shipping Carriers API"
-    ))
-    
-    # Test 6: Invoice Generation
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/api/invoices/generate?include_promotions=true",
-        method="POST",
-        data=sample_basket,
-        description="Invoice Generation API"
-    ))
+    # The endpoints are independent, so probe them all at once and print
+    # afterwards to keep the output readable
+    checks = [(f"{API_BASE}{path}", method, data, description)
+              for path, method, data, description in ENDPOINT_CHECKS]
+    results = run_checks(checks)
     
-    # Test 7: Invoice Template
-    tests.append(test_api_endpoint(
-        f"{API_BASE}/api/invoices/template/academic",
-        description="Invoice Template API"
-    ))
+    tests = [report_result(url, description, result)
+             for (url, _, _, description), result in zip(checks, results)]
     
     # Summary
     passed_tests = sum(tests)
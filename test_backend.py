@@ -1,44 +1,99 @@
 #!/usr/bin/env python3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import json
 import time
 
-def test_backend():
-    base_url = "http://127.0.0.1:8000"
-    
-    # Test root endpoint
+try:
+    import orjson  # C JSON codec, used for request bodies and responses when installed
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+BASE_URL = "http://127.0.0.1:8000"
+ROOT_URL = BASE_URL + "/"
+PRICING_URL = BASE_URL + "/api/pricing/optimize"
+SHIPPING_URL = BASE_URL + "/api/shipping/estimate"
+
+# (connect, read) timeouts, and retries for flaky restarts of the backend
+REQUEST_TIMEOUT = (1.0, 5.0)
+RETRY = Retry(total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+
+# Request bodies for the POST probes
+PRICING_PAYLOAD = {
+    "product_id": "TEST-001",
+    "current_price": 100.0,
+    "customer_segment": "premium",
+    "quantity": 1
+}
+SHIPPING_PAYLOAD = {
+    "product_category": "Reagents",
+    "origin": "New York, NY",
+    "destination": "Boston, MA",
+    "quantity": 1
+}
+
+def encode_json(obj):
+    """Serialize obj to JSON bytes."""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj).encode()
+
+def decode_json(content):
+    """Parse a JSON response body."""
+    return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+
+# POST bodies are serialized once, not on every request
+JSON_HEADERS = {"Content-Type": "application/json"}
+PRICING_BODY = encode_json(PRICING_PAYLOAD)
+SHIPPING_BODY = encode_json(SHIPPING_PAYLOAD)
+
+def probe_root(session):
+    """Test root endpoint; returns the lines to print."""
     try:
-        response = requests.get(f"{base_url}/")
-        print(f"Root endpoint: {response.status_code} - {response.json()}")
+        response = session.get(ROOT_URL, timeout=REQUEST_TIMEOUT)
+        return [f"Root endpoint: {response.status_code} - {decode_json(response.content)}"]
     except Exception as e:
-        print(f"Root endpoint error: {e}")
-    
-    # Test pricing endpoint
+        return [f"Root endpoint error: {e}"]
+
+def probe_pricing(session):
+    """Test pricing endpoint; returns the lines to print."""
     try:
-        response = requests.post(f"{base_url}/api/pricing/optimize", json={
-            "product_id": "TEST-001",
-            "current_price": 100.0,
-            "customer_segment": "premium",
-            "quantity": 1
-        })
-        print(f"Pricing endpoint: {response.status_code}")
+        response = session.post(PRICING_URL, data=PRICING_BODY, headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+        lines = [f"Pricing endpoint: {response.status_code}"]
         if response.status_code == 200:
-            print(f"Pricing response: {response.json()}")
+            lines.append(f"Pricing response: {decode_json(response.content)}")
+        return lines
     except Exception as e:
-        print(f"Pricing endpoint error: {e}")
-    
-    # Test shipping endpoint
+        return [f"Pricing endpoint error: {e}"]
+
+def probe_shipping(session):
+    """Test shipping endpoint; returns the lines to print."""
     try:
-        response = requests.post(f"{base_url}/api/shipping/estimate", json={
-            "product_category": "Reagents",
-            "origin": "New York, NY",
-            "destination": "Boston, MA",
-            "quantity": 1
-        })
-        print(f"Shipping endpoint: {response.status_code}")
+        response = session.post(SHIPPING_URL, data=SHIPPING_BODY, headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+        lines = [f"Shipping endpoint: {response.status_code}"]
         if response.status_code == 200:
-            print(f"Shipping response: {response.json()}")
+            lines.append(f"Shipping response: {decode_json(response.content)}")
+        return lines
     except Exception as e:
-        print(f"Shipping endpoint error: {e}")
+        return [f"Shipping endpoint error: {e}"]
+
+def test_backend():
+    probes = [probe_root, probe_pricing, probe_shipping]
+    
+    # One session for all probes, so connections are kept alive and reused; the
+    # probes are independent, so they run concurrently and print in order afterwards.
+    # uvicorn only speaks HTTP/1.1, so concurrency comes from one pooled keep-alive
+    # connection per probe rather than HTTP/2 streams on a single socket
+    with requests.Session() as session:
+        session.mount("http://", HTTPAdapter(max_retries=RETRY, pool_connections=4, pool_maxsize=4))
+        
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            results = list(executor.map(lambda probe: probe(session), probes))
+    
+    for lines in results:
+        for line in lines:
+            print(line)
 
 if __name__ == "__main__":
     test_backend()